@@ -0,0 +1,302 @@
+"""
+화재/위험도 이벤트 기록 저장소 (SQLite)
+- 대시보드는 record()로 큐에 넣기만 하고, 쓰기 스레드가 모아서 한 트랜잭션으로 저장
+- 시각, 위험도, 시나리오 색인으로 기록 탭의 조건 조회를 빠르게 수행 (WAL 모드라 쓰는 중에도 조회 가능)
+- 기록 탭은 EventTableModel로 한 페이지씩 불러옴 (스크롤하면 다음 페이지, 새 기록은 위에 추가)
+"""
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from PyQt5.QtCore import Qt, QObject, QAbstractTableModel, QModelIndex, pyqtSignal
+
+EVENT_DB_PATH = os.path.join(os.path.dirname(__file__), 'cache', 'events.sqlite')
+PAGE_SIZE = 200  # 기록 탭에서 한 번에 불러올 행 수
+WRITE_BATCH_SIZE = 500  # 쓰기 스레드가 한 트랜잭션에 저장할 최대 이벤트 수
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+ALL = "전체"
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS events ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+    "timestamp REAL NOT NULL, "
+    "kind TEXT NOT NULL, "
+    "severity TEXT, "
+    "scenario_id TEXT, "
+    "risk_score REAL, "
+    "message TEXT NOT NULL, "
+    "details TEXT)",
+    # 최신순 정렬과 날짜 범위 조회
+    "CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events (timestamp, id)",
+    # 조건 + 최신순 정렬을 색인만으로 처리
+    "CREATE INDEX IF NOT EXISTS idx_events_severity ON events (severity, timestamp, id)",
+    "CREATE INDEX IF NOT EXISTS idx_events_scenario ON events (scenario_id, timestamp, id)",
+]
+COLUMNS = ['timestamp', 'kind', 'severity', 'scenario_id', 'risk_score', 'message']
+HEADERS = ["시각", "종류", "위험도", "시나리오", "위험도 점수", "내용"]
+KIND_LABELS = {'risk': "위험도 경고", 'scenario': "시나리오"}
+
+def connect(path):
+    if path != ':memory:':
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    for statement in SCHEMA:
+        conn.execute(statement)
+    conn.commit()
+    return conn
+
+def day_range(date_text):
+    """'yyyy-MM-dd' -> 그날 0시부터 다음 날 0시까지의 (시작, 끝) 타임스탬프"""
+    start = datetime.strptime(date_text, "%Y-%m-%d").timestamp()
+    return start, start + 24 * 3600
+
+def build_where(date=None, severity=None, scenario_id=None):
+    """조건 dict를 (WHERE 절, 인자)로 변환 (값이 없거나 '전체'면 조건 없음)"""
+    clauses, params = [], []
+    if date:
+        start, end = day_range(date)
+        clauses.append("timestamp >= ? AND timestamp < ?")
+        params += [start, end]
+    if severity and severity != ALL:
+        clauses.append("severity = ?")
+        params.append(severity)
+    if scenario_id:
+        clauses.append("scenario_id = ?")
+        params.append(str(scenario_id))
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+class EventStore(QObject):
+    """
+    이벤트 기록 저장소 (스레드 안전)
+    - record(): 큐에 넣고 바로 반환 (GUI 스레드용)
+    - written(int): 쓰기 스레드가 저장을 마칠 때마다 마지막 id 전송
+    - count()/page()/newer(): 조회는 호출한 스레드의 전용 연결로 수행
+    """
+    written = pyqtSignal(int)
+
+    def __init__(self, path=EVENT_DB_PATH):
+        super().__init__()
+        self.path = path
+        self.queue = queue.Queue()
+        self.local = threading.local()
+        # 쓰기 연결은 생성 시 만들어 스키마까지 준비한 뒤 쓰기 스레드에만 넘김
+        self.write_conn = connect(path)
+        self.thread = threading.Thread(target=self._run, name='event-store', daemon=True)
+        self.thread.start()
+
+    def record(self, kind, message, severity=None, scenario_id=None, risk_score=None, details=None,
+               timestamp=None):
+        self.queue.put((
+            timestamp if timestamp is not None else time.time(),
+            kind,
+            severity,
+            str(scenario_id) if scenario_id is not None else None,
+            risk_score,
+            message,
+            json.dumps(details, ensure_ascii=False) if details is not None else None,
+        ))
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                break
+            batch = [item]
+            # 밀려 있는 이벤트는 한 트랜잭션으로 저장
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self.queue.put(None)
+                    self.queue.task_done()
+                    break
+                batch.append(item)
+            try:
+                with self.write_conn:
+                    self.write_conn.executemany(
+                        "INSERT INTO events (timestamp, kind, severity, scenario_id, risk_score, message, details) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+                last_id = self.write_conn.execute("SELECT MAX(id) FROM events").fetchone()[0]
+                self.written.emit(last_id or 0)
+            except sqlite3.Error as e:
+                print(f"이벤트 기록 저장 중 오류 발생: {e}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+        self.write_conn.close()
+
+    def flush(self):
+        """큐에 있는 이벤트가 모두 저장될 때까지 대기"""
+        self.queue.join()
+
+    def close(self):
+        if self.thread is None:
+            return
+        self.queue.put(None)
+        self.thread.join()
+        self.thread = None
+        conn = getattr(self.local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self.local.conn = None
+
+    def reader(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = connect(self.path)
+            conn.row_factory = sqlite3.Row
+            self.local.conn = conn
+        return conn
+
+    def count(self, **filters):
+        where, params = build_where(**filters)
+        return self.reader().execute(f"SELECT COUNT(*) FROM events{where}", params).fetchone()[0]
+
+    def page(self, before=None, limit=PAGE_SIZE, **filters):
+        """최신순으로 limit개 (before=(시각, id)가 있으면 그보다 오래된 것부터, 키셋 페이지 이동)"""
+        where, params = build_where(**filters)
+        if before is not None:
+            where += (" AND " if where else " WHERE ") + "(timestamp, id) < (?, ?)"
+            params += list(before)
+        return self.reader().execute(
+            f"SELECT * FROM events{where} ORDER BY timestamp DESC, id DESC LIMIT ?", params + [limit]
+        ).fetchall()
+
+    def newer(self, after, **filters):
+        """after=(시각, id)보다 새로 저장된 이벤트 (최신순)"""
+        where, params = build_where(**filters)
+        where += (" AND " if where else " WHERE ") + "(timestamp, id) > (?, ?)"
+        return self.reader().execute(
+            f"SELECT * FROM events{where} ORDER BY timestamp DESC, id DESC", params + list(after)
+        ).fetchall()
+
+class EventTableModel(QAbstractTableModel):
+    """기록 탭 표 모델 - 현재 조건의 이벤트를 페이지 단위로 불러옴"""
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.filters = {}
+        self.rows = []
+        self.total = 0
+        self.exhausted = True
+
+    def set_filters(self, **filters):
+        self.filters = filters
+        self.reload()
+
+    def reload(self):
+        self.beginResetModel()
+        self.total = self.store.count(**self.filters)
+        self.rows = list(self.store.page(**self.filters))
+        self.exhausted = len(self.rows) >= self.total
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self.rows:
+            return
+        last = self.rows[-1]
+        rows = self.store.page(before=(last['timestamp'], last['id']), **self.filters)
+        if len(rows) < PAGE_SIZE:
+            self.exhausted = True
+        if rows:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(rows) - 1)
+            self.rows.extend(rows)
+            self.endInsertRows()
+
+    def append_newer(self):
+        """새로 저장된 이벤트 중 조건에 맞는 것을 맨 위에 추가 (불러온 페이지와 스크롤은 유지)"""
+        if not self.rows:
+            self.reload()
+            return
+        first = self.rows[0]
+        rows = self.store.newer((first['timestamp'], first['id']), **self.filters)
+        if rows:
+            self.beginInsertRows(QModelIndex(), 0, len(rows) - 1)
+            self.rows[:0] = rows
+            self.total += len(rows)
+            self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        column = COLUMNS[index.column()]
+        if role == Qt.DisplayRole:
+            value = row[column]
+            if value is None:
+                return ""
+            if column == 'timestamp':
+                return datetime.fromtimestamp(value).strftime(TIME_FORMAT)
+            if column == 'kind':
+                return KIND_LABELS.get(value, value)
+            if column == 'risk_score':
+                return f"{value:.1f}%"
+            if column == 'message':
+                # 여러 줄 기록은 첫 줄만 표시하고 전체는 툴팁으로
+                return value.splitlines()[0] if value else ""
+            return str(value)
+        if role == Qt.ToolTipRole and column == 'message':
+            return row['message']
+        return None
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_event_store():
+    """앱 전체에서 공유하는 저장소 (처음 요청할 때 생성)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = EventStore()
+        return _store
+
+def close_event_store():
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
+
+if __name__ == "__main__":
+    # 예: python -m code.Front.eventStore --date 2025-06-01 --severity 높음
+    import argparse
+    parser = argparse.ArgumentParser(description="이벤트 기록 조회")
+    parser.add_argument('--db', default=EVENT_DB_PATH)
+    parser.add_argument('--date', default=None, help="yyyy-mm-dd")
+    parser.add_argument('--severity', default=None)
+    parser.add_argument('--scenario', default=None)
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    store = EventStore(args.db)
+    try:
+        filters = {'date': args.date, 'severity': args.severity, 'scenario_id': args.scenario}
+        print(f"조건에 맞는 기록: {store.count(**filters)}개")
+        for row in store.page(limit=args.limit, **filters):
+            stamp = datetime.fromtimestamp(row['timestamp']).strftime(TIME_FORMAT)
+            print(f"[{stamp}] {row['kind']} {row['severity'] or ''} {row['message'].splitlines()[0]}")
+    finally:
+        store.close()
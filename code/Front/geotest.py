@@ -1,8 +1,17 @@
 #/* Python 코드 사용예제 */     
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 import requests	
+
+from code.Map.offlineGeocoder import offline_reverse
 		
 
 def get_road_address_from_coords(lat, lon):
+    # 오프라인 가제티어에서 먼저 찾고, 없을 때만 Nominatim 조회
+    address = offline_reverse(lat, lon)
+    if address:
+        return address
+
     url = "https://nominatim.openstreetmap.org/reverse"
     params = {
         "lat": lat,
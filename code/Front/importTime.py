@@ -0,0 +1,103 @@
+"""
+GUI 시작 시 import 시간 보고서 (python -X importtime 결과 요약)
+- 별도 프로세스에서 모듈을 import 하고 stderr의 importtime 표를 읽어 합계/상위 모듈/패키지별 시간 출력
+- --budget-ms를 넘으면 종료 코드 1 (시작 시간이 다시 느려졌는지 확인용)
+
+실행 예:
+    python -m code.Front.importTime
+    python -m code.Front.importTime --module code.Front.index --top 15 --budget-ms 1500
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+
+DEFAULT_MODULE = 'code.Front.index'
+DEFAULT_TOP = 20
+REPORT_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'profiles', 'import_time.json')
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# import time:       self [us] |  cumulative | imported package
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+def parse_importtime(stderr):
+    """[(모듈 이름, self us, cumulative us, 깊이), ...]"""
+    entries = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            depth = max(0, (len(indent) - 1) // 2)
+            entries.append((name, int(self_us), int(cumulative_us), depth))
+    return entries
+
+def measure(module=DEFAULT_MODULE, python=sys.executable):
+    """새 프로세스에서 module을 import 하고 (importtime 항목, 오류 메시지) 반환"""
+    result = subprocess.run(
+        [python, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    entries = parse_importtime(result.stderr)
+    error = None
+    if result.returncode != 0:
+        # importtime 표를 제외한 나머지(Traceback)를 오류로 표시
+        error = "\n".join(line for line in result.stderr.splitlines() if not IMPORTTIME_LINE.match(line))
+    return entries, error
+
+def summarize(entries, top=DEFAULT_TOP):
+    # 최상위(깊이 0) 항목의 누적 시간 합이 전체 import 시간
+    total_us = sum(cumulative for _, _, cumulative, depth in entries if depth == 0)
+    packages = {}
+    for name, self_us, _, _ in entries:
+        package = name.split('.')[0]
+        packages[package] = packages.get(package, 0) + self_us
+    return {
+        'total_ms': total_us / 1000,
+        'module_count': len(entries),
+        'top_cumulative': [{'module': name, 'ms': cumulative / 1000}
+                           for name, _, cumulative, _ in sorted(entries, key=lambda e: -e[2])[:top]],
+        'top_self': [{'module': name, 'ms': self_us / 1000}
+                     for name, self_us, _, _ in sorted(entries, key=lambda e: -e[1])[:top]],
+        'packages': [{'package': package, 'ms': us / 1000}
+                     for package, us in sorted(packages.items(), key=lambda item: -item[1])[:top]],
+    }
+
+def print_report(module, summary):
+    print(f"[{module}] import 시간 합계: {summary['total_ms']:.1f}ms (모듈 {summary['module_count']}개)")
+    print("\n누적 시간 상위 모듈")
+    for item in summary['top_cumulative']:
+        print(f"  {item['ms']:9.1f}ms  {item['module']}")
+    print("\n자체 시간 상위 모듈")
+    for item in summary['top_self']:
+        print(f"  {item['ms']:9.1f}ms  {item['module']}")
+    print("\n패키지별 자체 시간 합계")
+    for item in summary['packages']:
+        print(f"  {item['ms']:9.1f}ms  {item['package']}")
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="import 시간 보고서")
+    parser.add_argument('--module', default=DEFAULT_MODULE, help="측정할 모듈")
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help="표시할 상위 항목 수")
+    parser.add_argument('--budget-ms', type=float, default=None, help="합계가 이 값을 넘으면 종료 코드 1")
+    parser.add_argument('--output', default=REPORT_PATH, help="JSON 보고서 경로 ('-'면 저장 안 함)")
+    args = parser.parse_args()
+
+    entries, error = measure(args.module)
+    if error:
+        print(f"import 중 오류 발생:\n{error}")
+    if not entries:
+        sys.exit(1)
+    summary = summarize(entries, args.top)
+    print_report(args.module, summary)
+
+    if args.output != '-':
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'module': args.module, **summary}, f, ensure_ascii=False, indent=2)
+        print(f"\n보고서를 저장했습니다: {os.path.abspath(args.output)}")
+
+    if args.budget_ms is not None and summary['total_ms'] > args.budget_ms:
+        print(f"시작 import 시간 예산 초과: {summary['total_ms']:.1f}ms > {args.budget_ms:.1f}ms")
+        sys.exit(1)
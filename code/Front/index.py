@@ -1,56 +1,84 @@
 import os, sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-import requests
-import folium
 from datetime import datetime
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QTabWidget, QTextEdit, QTableWidget, QTableWidgetItem,
     QGroupBox, QGridLayout, QProgressBar,
-    QHeaderView, QLineEdit, QComboBox, QDateEdit, QSpinBox, QFileDialog, QStatusBar
+    QHeaderView, QLineEdit, QCheckBox, QTableView, QAbstractItemView, QComboBox, QDateEdit, QSpinBox, QFileDialog, QStatusBar
 )
-from PyQt5.QtCore import Qt, QUrl, QDate
+from PyQt5.QtCore import Qt, QUrl, QDate, QTimer, QThreadPool, QRunnable, QObject, pyqtSignal
 from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEngineSettings, QWebEngineProfile
 import PyQt5
 from PyQt5.QtGui import *
 from typing import Dict
-import cv2
+import importlib
+import time
 import numpy as np
-import torch
-from ultralytics import YOLO
-
-from code.test.LinearProgramming.respondFireConfigure import main as run_optimization
-from code.test.LinearProgramming.respondFireConfigure import generate_scenarios_from_data
-from code.test.LinearProgramming.respondFireConfigure import ResourceAllocator
-from code.test.LinearProgramming.respondFireConfigure import RiskCalculator
-from code.test.LinearProgramming.respondFireConfigure import load_and_preprocess_data_for_scenario
 
-from code.Map.Map import WildfireMap
+from code.Map.liveMap import write_live_map, js_call, point_feature, feature_collection
+from code.Front.weatherPoller import WeatherPoller
 from code.Front.key import key
-from code.Front.index_popup import IndexPopup
-
-#주소 찾기 코드 - 비동기
-import asyncio
-import aiohttp
-
-# YOLO 모델 로드
-fire_model = YOLO('model_/best.pt')  # 학습된 모델 이용
-
-def visualize_fire_detection(frame, results):
-    for result in results:
-        boxes = result.boxes
-        for box in boxes:
-            x1, y1, x2, y2 = box.xyxy[0]
-            conf = box.conf[0]
-            cls = box.cls[0]
-            cv2.rectangle(frame, (int(x1), int(y1)), (int(x2), int(y2)), (0, 0, 255), 2)
-            cv2.putText(frame, f'Fire: {conf:.2f}', (int(x1), int(y1-10)), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 0, 255), 2)
-    return frame
+
+#주소 찾기 코드 - 공용 지오코딩 서비스 (백그라운드 이벤트 루프)
+from code.Map.geocoder import get_geocoding_service, close_geocoding_service
+from code.Map.offlineGeocoder import check_gazetteer
+from code.Front.eventStore import EventTableModel, get_event_store, close_event_store
+
+# torch/ultralytics, cv2, folium, pulp, sklearn, respondFireConfigure 등 무거운 모듈과 YOLO 모델은
+# 처음 사용할 때 불러오며, 창이 뜬 뒤 백그라운드에서 미리 불러옴
+PRELOAD_MODULES = [
+    'code.test.LinearProgramming.respondFireConfigure',
+    'code.Front.optimizationTask',
+    'code.test.fireSpread.forest',  # 팝업용 수목 데이터 CSV
+    'code.Front.videoWorker',
+]
+# matplotlib(Qt 백엔드)을 불러오는 모듈은 GUI 스레드에서만 import (백그라운드 모듈 로드가 끝난 뒤)
+GUI_PRELOAD_MODULES = [
+    'code.Front.index_popup',
+]
+PRELOAD_FIRE_MODEL = True
+PRELOAD_DELAY_MS = 300  # 창이 그려질 시간을 준 뒤 시작
+
+class PreloadSignals(QObject):
+    # 모듈 불러오기가 끝나면 바로 전송 (모델 로드를 기다리지 않음), 인자는 모두 성공했는지 여부
+    modules_ready = pyqtSignal(bool)
+    finished = pyqtSignal()
+
+class PreloadTask(QRunnable):
+    """무거운 모듈과 화재 감지 모델을 백그라운드 스레드에서 미리 불러옴"""
+    def __init__(self, modules=PRELOAD_MODULES, load_fire_model=PRELOAD_FIRE_MODEL):
+        super().__init__()
+        self.modules = modules
+        self.load_fire_model = load_fire_model
+        self.signals = PreloadSignals()
+        self.setAutoDelete(False)
+
+    def run(self):
+        ok = True
+        for name in self.modules:
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                ok = False
+                print(f"모듈 미리 불러오기 실패 ({name}): {e}")
+        self.signals.modules_ready.emit(ok)
+        # 화재 감지 모델은 영상 분석에만 필요하므로 대시보드 갱신 후 이어서 로드
+        if self.load_fire_model:
+            try:
+                import code.videoProcess.videoProcess as vP
+                vP.get_fire_model()
+            except Exception as e:
+                print(f"화재 감지 모델 미리 불러오기 실패: {e}")
+        self.signals.finished.emit()
 
 # 상수 정의
 MAP_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'maps')
 os.makedirs(MAP_DIR, exist_ok=True)
+OPTIMIZATION_COALESCE_MS = 500  # 이 시간 안에 들어온 최적화 요청은 한 번만 실행
+WEATHER_LOCATION = '가좌동'
+WEATHER_LOCATION_LABEL = '진주시 가좌동'
+WEATHER_COORDS = (35.1767, 128.1035)
 
 def find_qtwebengine_process():
     # PyQt5 설치 경로 찾기
@@ -89,7 +117,10 @@ class Messenger:
         self.show_popup()
 
     def show_popup(self):
+        # 시뮬레이터(matplotlib, 수목 데이터 CSV)는 팝업을 처음 띄울 때 불러옴
+        from code.Front.index_popup import IndexPopup
         self.popup = IndexPopup(self.scenario, self.result, parent=self.parent)
+        self.popup.setAttribute(Qt.WA_DeleteOnClose)  # 닫으면 시뮬레이터와 함께 해제
         self.popup.show()  # 비모달로 표시
 
 class FireGuardApp(QMainWindow):
@@ -99,9 +130,43 @@ class FireGuardApp(QMainWindow):
         self.setGeometry(100, 100, 1200, 800)
         self.setWindowIcon(QIcon('code\Front\icon.png'))
         self.popups = []
+        self.preload_task = None
+        check_gazetteer()  # 오프라인 주소 조회 데이터가 없으면 시작할 때 한 번 안내
         self.initUI()
-        self.video_tab.FIRE_SIGNAL.connect(self.handle_fire_signal)
-        self.video_tab.CONF_SIGNAL.connect(self.run_fire_optimization_and_show_map)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.preload_task is None:
+            self.preload_task = PreloadTask()
+            self.preload_task.signals.modules_ready.connect(self.on_modules_ready)
+            QTimer.singleShot(PRELOAD_DELAY_MS, lambda: QThreadPool.globalInstance().start(self.preload_task))
+
+    def on_modules_ready(self, ok):
+        """백그라운드 모듈 로드 후 GUI 스레드에서 matplotlib 팝업 모듈을 불러오고 대시보드 갱신"""
+        for name in GUI_PRELOAD_MODULES:
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                ok = False
+                print(f"모듈 미리 불러오기 실패 ({name}): {e}")
+        self.dashboard_tab.on_backend_ready(ok)
+
+    def closeEvent(self, event):
+        # 영상 분석 스레드가 남아 있으면 종료 후 닫기
+        video_tab = self.created_tabs.get('video_tab')
+        if video_tab is not None:
+            video_tab.wait_analysis()
+        if self.optimization_task is not None:
+            self.optimization_task.cancel()
+        try:
+            close_geocoding_service()
+        except Exception as e:
+            # 종료 요청이 시간 안에 끝나지 않아도(TimeoutError) 창은 닫음 (루프 스레드는 데몬)
+            print(f"주소 조회 서비스 종료 중 오류 발생: {e}")
+        # 큐에 남은 이벤트 기록을 저장하고 닫기
+        close_event_store()
+        self.dashboard_tab.weather_poller.stop()
+        super().closeEvent(event)
 
     def initUI(self):
         # WebEngine 설정 초기화
@@ -112,25 +177,92 @@ class FireGuardApp(QMainWindow):
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
         self.status_bar = self.statusBar()
-        self.video_tab = VideoTab(status_bar=self.status_bar)
 
+        # 첫 화면인 대시보드만 바로 만들고, 나머지 탭은 처음 선택하거나 사용할 때 생성
         self.dashboard_tab = DashboardTab()
-        self.resource_tab = ResourceManagementTab()
-        self.history_tab = HistoryTab()
+        self.lazy_tabs = {}  # 속성 이름 -> (자리표시 위젯, 탭 제목, 생성 함수)
+        self.created_tabs = {}
 
-        # 탭들 서로 연결
-        self.history_tab.connect_dashboard(self.dashboard_tab)
-        self.resource_tab.connect_dashboard(self.dashboard_tab)
+        # 자원 최적화는 스레드 풀에서 실행, 실행 중에는 버튼이 취소 버튼으로 바뀜
+        self.optimization_task = None
+        self.optimization_timer = QTimer(self)
+        self.optimization_timer.setSingleShot(True)
+        self.optimization_timer.setInterval(OPTIMIZATION_COALESCE_MS)
+        self.optimization_timer.timeout.connect(self.start_optimization)
+        self.optimization_progress = QProgressBar()
+        self.optimization_progress.setMaximumWidth(200)
+        self.optimization_progress.hide()
+        self.status_bar.addPermanentWidget(self.optimization_progress)
 
-        optimize_button = QPushButton("자원 최적화 실행")
-        optimize_button.clicked.connect(self.run_fire_optimization_and_show_map)
-        self.tabs.setCornerWidget(optimize_button)
+        self.optimize_button = QPushButton("자원 최적화 실행")
+        self.optimize_button.clicked.connect(self.toggle_optimization)
+        self.tabs.setCornerWidget(self.optimize_button)
 
 
         self.tabs.addTab(self.dashboard_tab, "실시간 상황")
-        self.tabs.addTab(self.resource_tab, "자원 관리")
-        self.tabs.addTab(self.history_tab, "기록 조회")
-        self.tabs.addTab(self.video_tab, "영상 분석")
+        self.add_lazy_tab('resource_tab', "자원 관리", self.create_resource_tab)
+        self.add_lazy_tab('history_tab', "기록 조회", self.create_history_tab)
+        self.add_lazy_tab('video_tab', "영상 분석", self.create_video_tab)
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+
+    def add_lazy_tab(self, name, title, factory):
+        placeholder = QWidget()
+        self.lazy_tabs[name] = (placeholder, title, factory)
+        self.tabs.addTab(placeholder, title)
+
+    def ensure_tab(self, name):
+        """탭이 아직 없으면 생성해 자리표시 위젯과 교체"""
+        tab = self.created_tabs.get(name)
+        if tab is not None:
+            return tab
+        placeholder, title, factory = self.lazy_tabs[name]
+        tab = factory()
+        self.created_tabs[name] = tab
+
+        index = self.tabs.indexOf(placeholder)
+        current = self.tabs.currentIndex()
+        self.tabs.blockSignals(True)
+        self.tabs.removeTab(index)
+        self.tabs.insertTab(index, tab, title)
+        self.tabs.setCurrentIndex(current)
+        self.tabs.blockSignals(False)
+        placeholder.deleteLater()
+        return tab
+
+    def on_tab_changed(self, index):
+        widget = self.tabs.widget(index)
+        for name, (placeholder, _, _) in self.lazy_tabs.items():
+            if name not in self.created_tabs and widget is placeholder:
+                self.ensure_tab(name)
+                break
+
+    def create_resource_tab(self):
+        tab = ResourceManagementTab()
+        tab.connect_dashboard(self.dashboard_tab)
+        return tab
+
+    def create_history_tab(self):
+        tab = HistoryTab()
+        tab.connect_dashboard(self.dashboard_tab)
+        return tab
+
+    def create_video_tab(self):
+        tab = VideoTab(status_bar=self.status_bar)
+        tab.FIRE_SIGNAL.connect(self.handle_fire_signal)
+        tab.CONF_SIGNAL.connect(self.run_fire_optimization_and_show_map)
+        return tab
+
+    @property
+    def resource_tab(self):
+        return self.ensure_tab('resource_tab')
+
+    @property
+    def history_tab(self):
+        return self.ensure_tab('history_tab')
+
+    @property
+    def video_tab(self):
+        return self.ensure_tab('video_tab')
 
     def handle_fire_signal(self, confidence, frame):
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -142,33 +274,70 @@ class FireGuardApp(QMainWindow):
         #self.enhance_and_run_simulation()
 
     def run_fire_optimization_and_show_map(self):
-        # 데이터 로드 및 전처리
-        df_processed = load_and_preprocess_data_for_scenario('./datasets/WSQ000301.csv')
-        if df_processed is None:
-            print("데이터 로드 오류")
+        """최적화 요청 (화재 확정 신호가 연달아 와도 한 번만 실행)"""
+        if self.optimization_task is not None:
+            # 실행 중 들어온 중복 요청은 현재 실행으로 합침
+            self.status_bar.showMessage("자원 최적화가 이미 진행 중입니다.")
             return
+        # 짧은 시간 안에 들어온 요청들을 모아 한 번만 시작
+        self.optimization_timer.start()
 
-        # 시나리오 생성
-        scenarios = generate_scenarios_from_data(df_processed)
-        if not scenarios:
-            print("시나리오가 생성되지 않음")
-            return
+    def toggle_optimization(self):
+        if self.optimization_task is not None:
+            self.optimization_task.cancel()
+            self.status_bar.showMessage("자원 최적화 취소 중... (현재 단계가 끝나면 중단)")
+        else:
+            self.run_fire_optimization_and_show_map()
 
-        # 자원 관리 탭의 모든 설정을 반영
+    def start_optimization(self):
+        if self.optimization_task is not None:
+            return
+        from code.Front.optimizationTask import OptimizationTask
+        # 자원 관리 탭의 모든 설정은 GUI 스레드에서 미리 읽어 전달
         truck_settings, personnel_settings = self.resource_tab.get_all_resource_settings()
-        allocator = ResourceAllocator()
-        
-        # 자원 설정 적용
-        for truck_type, qty in truck_settings.items():
-            allocator.set_resource_deployment('truck', truck_type, qty)
-        for personnel_type, qty in personnel_settings.items():
-            allocator.set_resource_deployment('firefighter', personnel_type, qty)
+        task = OptimizationTask(truck_settings, personnel_settings,
+                                geocoder=self.resource_tab.fetch_resource_addresses)
+        task.signals.progress.connect(self.on_optimization_progress)
+        task.signals.finished.connect(self.on_optimization_finished)
+        task.signals.failed.connect(self.on_optimization_failed)
+        task.signals.cancelled.connect(self.on_optimization_cancelled)
+        self.optimization_task = task
+
+        self.optimize_button.setText("최적화 취소")
+        self.optimization_progress.setValue(0)
+        self.optimization_progress.show()
+        QThreadPool.globalInstance().start(task)
+
+    def end_optimization(self, message):
+        self.optimization_task = None
+        self.optimize_button.setText("자원 최적화 실행")
+        self.optimization_progress.hide()
+        self.status_bar.showMessage(message)
+
+    def on_optimization_progress(self, percent, label):
+        self.optimization_progress.setValue(percent)
+        self.status_bar.showMessage(label)
+
+    def on_optimization_failed(self, message):
+        print(message)
+        self.end_optimization(f"자원 최적화 실패: {message}")
+
+    def on_optimization_cancelled(self):
+        self.end_optimization("자원 최적화가 취소되었습니다.")
+
+    def on_popup_closed(self, messenger):
+        """닫힌 팝업의 기상 정보 연결을 끊고 목록에서 제거"""
+        try:
+            self.dashboard_tab.weather_poller.weather_updated.disconnect(messenger.popup.update_weather)
+        except TypeError:
+            pass  # 이미 연결이 끊긴 경우
+        if messenger in self.popups:
+            self.popups.remove(messenger)
 
-        # 자원 현황 업데이트
-        self.dashboard_tab.update_resource_status()
-        
-        # 첫 번째 시나리오 선택
-        scenario_to_display = scenarios[0]
+    def on_optimization_finished(self, payload):
+        self.end_optimization("자원 최적화 완료")
+        scenario_to_display = payload['scenario']
+        results = payload['results']
 
         if not scenario_to_display.sites:
             print(f"선택된 시나리오 {scenario_to_display.id}에 사이트 정보가 없습니다.")
@@ -179,73 +348,22 @@ class FireGuardApp(QMainWindow):
             # 지도 및 알림 등도 초기화 필요
             return
 
-        # 선택된 시나리오에 대해 최적화 수행
-        results, cost = allocator.optimize_single_scenario(scenario_to_display)
-        
         # UI 업데이트 (선택된 시나리오의 모든 사이트 정보 사용)
         
         # 화재 위협 정보 업데이트 (해당 시나리오의 사이트 수)
         self.dashboard_tab.fire_count_label.setText(str(len(scenario_to_display.sites)))
 
         # 위협 목록 업데이트 (해당 시나리오의 모든 사이트 정보 나열)
-        threat_list = []
-        total_risk_score_sum = 0.0
-        risk_factor_sums = {'wind_speed': 0.0, 'humidity': 0.0, 'slope': 0.0}
-        fuel_types = []
-        damage_classes = []
-        num_sites_with_risk_factors = 0
-
-        for site_id, site_info in scenario_to_display.sites.items():
-            risk_factors = site_info['risk_factors']
-            risk_score = self.dashboard_tab.risk_calculator.calculate_risk_score(risk_factors)
-            risk_level = self.dashboard_tab.risk_calculator.get_risk_level(risk_score)
-            threat_list.append(f"위치 {site_id}: {risk_level} ({risk_score}%) - 예상 피해면적 {site_info.get('predicted_damage_area_ha', 0.0):.2f}ha")
-            total_risk_score_sum += risk_score
-
-            # 평균 위험 요인 계산을 위한 데이터 누적
-            try: risk_factor_sums['wind_speed'] += float(risk_factors.get('wind_speed', 0.0))
-            except ValueError: pass
-            try: risk_factor_sums['humidity'] += float(risk_factors.get('humidity', 0.0))
-            except ValueError: pass
-            try: risk_factor_sums['slope'] += float(risk_factors.get('slope', 0.0))
-            except ValueError: pass
-            fuel_types.append(str(risk_factors.get('fuel_type', 'Unknown')))
-            damage_classes.append(str(risk_factors.get('damage_class', 'Unknown')))
-            num_sites_with_risk_factors += 1
-
-        self.dashboard_tab.threat_list.setText("\n".join(threat_list))
+        self.dashboard_tab.threat_list.setText("\n".join(payload['threat_list']))
 
         # 위험도 평가 업데이트 (해당 시나리오의 모든 사이트 평균 위험도 반영)
-        avg_risk_score_overall = total_risk_score_sum / len(scenario_to_display.sites) if scenario_to_display.sites else 0.0
-
-        # 평균 위험 요인 계산
-        avg_risk_factors_for_display = {}
-        if num_sites_with_risk_factors > 0:
-            avg_risk_factors_for_display['wind_speed'] = risk_factor_sums['wind_speed'] / num_sites_with_risk_factors
-            avg_risk_factors_for_display['humidity'] = risk_factor_sums['humidity'] / num_sites_with_risk_factors
-            avg_risk_factors_for_display['slope'] = risk_factor_sums['slope'] / num_sites_with_risk_factors
-            # 범주형 변수는 최빈값 또는 가장 위험한 값 등으로 처리 (여기서는 간단히 첫 번째 값 사용)
-            avg_risk_factors_for_display['fuel_type'] = fuel_types[0] if fuel_types else 'Unknown'
-            avg_risk_factors_for_display['damage_class'] = damage_classes[0] if damage_classes else 'Unknown'
-
+        avg_risk_score_overall = payload['avg_risk_score']
+        avg_risk_factors_for_display = payload['avg_risk_factors']
         self.dashboard_tab.update_risk_assessment(avg_risk_factors_for_display)
 
-        # 지도 생성 및 표시 (해당 시나리오의 배치 결과 사용)
-        if results:
-            map_obj = WildfireMap(
-                center_lat=scenario_to_display.base_station['latitude'],
-                center_lon=scenario_to_display.base_station['longitude'],
-                zoom=12
-            )
-            map_obj.add_resource_allocations(scenario_to_display.base_station, results)
-
-            # 지도 파일 저장
-            map_path = os.path.abspath(os.path.join(MAP_DIR, f'scenario_{scenario_to_display.id}_map.html'))
-            map_obj.show_map(map_path)
-            print(f"지도 파일이 저장되었습니다: {map_path}")
-
-            # 생성된 지도를 MapTab에 표시
-            self.dashboard_tab.map_widget.load_scenario_map(scenario_to_display.id)
+        # 작업 스레드에서 만든 배치 피처 중 바뀐 것만 지도에 반영
+        if payload['map_features']:
+            self.dashboard_tab.map_widget.show_resource_allocations(scenario_to_display.id, payload['map_features'])
 
         # 자원 배치 알림 추가
         if results:
@@ -264,16 +382,25 @@ class FireGuardApp(QMainWindow):
             scenario_log += f"- 배치된 자원: {len(results)}개\n"
             #scenario_log += f"- 예상 비용: {cost:,.0f}원\n"
 
-            self.dashboard_tab.fire_logs.append(scenario_log)
-            self.history_tab.log_view.append(scenario_log)
+            # 기록 탭은 이벤트 저장소의 저장 완료 시그널로 갱신됨
+            self.dashboard_tab.event_store.record(
+                'scenario', scenario_log,
+                severity=self.dashboard_tab.risk_calculator.get_risk_level(avg_risk_score_overall),
+                scenario_id=scenario_to_display.id,
+                risk_score=avg_risk_score_overall,
+                details={'sites': len(scenario_to_display.sites), 'resources': len(results)},
+            )
 
-            # 자원 탭의 위치 정보 업데이트
-            self.resource_tab.update_resource_locations(results)
+            # 자원 탭의 위치 정보 업데이트 (주소는 작업 스레드에서 조회 완료)
+            self.resource_tab.apply_resource_locations(results, payload['addresses'])
 
             # 위험도 팝업 표시
             try:
                 # 팝업에는 전체 평균 위험 요인 전달
                 m = Messenger(avg_risk_factors_for_display, parent=self, result=results)
+                # 이후 들어오는 기상 정보는 다음 시뮬레이션 실행에 반영 (팝업을 닫으면 연결 해제)
+                self.dashboard_tab.weather_poller.weather_updated.connect(m.popup.update_weather)
+                m.popup.finished.connect(lambda _, m=m: self.on_popup_closed(m))
                 self.popups.append(m)
             except Exception as e:
                 print(f"팝업 생성 중 오류 발생: {e}")
@@ -282,18 +409,47 @@ class FireGuardApp(QMainWindow):
         # 자원 현황 업데이트
         self.dashboard_tab.update_resource_status()
 
-        # 루프 종료 (첫 번째 시나리오만 사용)
-        # break # 이미 첫 번째 시나리오만 선택했으므로 break는 불필요
-
 
 class DashboardTab(QWidget):
     def __init__(self):
         super().__init__()
-        self.fire_logs = []
-        self.risk_calculator = RiskCalculator()
+        # 위험도 경고/시나리오 기록은 SQLite 이벤트 저장소에 비동기로 저장 (재시작 후에도 유지)
+        self.event_store = get_event_store()
+        self._risk_calculator = None
+        # 자원 현황/위험도 계산은 respondFireConfigure를 미리 불러온 뒤(on_backend_ready) 갱신
+        self.backend_ready = False
+        self.pending_risk_factors = None
         self.initUI()
-        self.update_weather_data()
-        self.update_resource_status()
+        # 기상 정보는 백그라운드에서 주기적으로 조회하고 시그널로 받음
+        self.weather_poller = WeatherPoller(key)
+        self.weather_poller.add_location(WEATHER_LOCATION, *WEATHER_COORDS)
+        self.weather_poller.weather_updated.connect(self.apply_weather)
+        self.weather_poller.start()
+
+    @property
+    def risk_calculator(self):
+        # 위험도 계산기는 respondFireConfigure(pandas, pulp, sklearn)에 있으므로 처음 사용할 때 불러옴
+        if self._risk_calculator is None:
+            from code.test.LinearProgramming.respondFireConfigure import RiskCalculator
+            self._risk_calculator = RiskCalculator()
+        return self._risk_calculator
+
+    def on_backend_ready(self, ok=True):
+        """백그라운드 모듈 불러오기가 끝나면 자원 현황과 미뤄 둔 위험도 갱신"""
+        self.backend_ready = True
+        if not ok:
+            print("일부 모듈을 미리 불러오지 못했습니다. 자원 현황/위험도는 처음 사용할 때 다시 시도합니다.")
+        # 불러오기에 실패했어도 슬롯 밖으로 예외를 던지지 않음
+        try:
+            self.update_resource_status()
+        except Exception as e:
+            print(f"자원 현황 갱신 중 오류 발생: {e}")
+        if self.pending_risk_factors is not None:
+            risk_factors, self.pending_risk_factors = self.pending_risk_factors, None
+            try:
+                self.update_risk_assessment(risk_factors)
+            except Exception as e:
+                print(f"위험도 갱신 중 오류 발생: {e}")
 
     def initUI(self):
         # --- 좌측 상단 네모들 ---
@@ -358,7 +514,7 @@ class DashboardTab(QWidget):
 
         resources_box.setLayout(resources_layout)
 
-        self.weather_box = QGroupBox("기상 정보 (진주시 가좌동)")
+        self.weather_box = QGroupBox(f"기상 정보 ({WEATHER_LOCATION_LABEL})")
         self.weather_box.setFixedSize(280, 280)
         self.weather_layout = QGridLayout()
 
@@ -439,44 +595,31 @@ class DashboardTab(QWidget):
         if risk_score >= 60:
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             log_entry = f"[{timestamp}] ⚠️ 위험도 {risk_score}% ({risk_level}) - {', '.join(risk_factors_desc)}"
-            self.fire_logs.append(log_entry)
+            self.event_store.record('risk', log_entry, severity=risk_level, risk_score=risk_score,
+                                    details={'factors': risk_factors_desc})
             
             # 실시간 알림 업데이트
             self.alert_text.append(log_entry)
             self.alert_text.setStyleSheet("color: red; font-weight: bold;")
 
     def update_weather_data(self):
-        api_key = key
-        lat, lon = 35.1767, 128.1035
-        url = (f"http://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={api_key}&units=metric&lang=kr")
+        """기상 정보 즉시 갱신 요청 (결과는 apply_weather로 전달됨)"""
+        self.weather_poller.refresh_now()
 
-        try:
-            response = requests.get(url)
-            response.raise_for_status()  # HTTP 오류 확인
-            data = response.json()
-            
-            # API 응답 검증
-            if 'main' not in data or 'wind' not in data:
-                raise ValueError("필수 날씨 데이터가 누락되었습니다.")
-
-            # 날씨 데이터 추출
-            wind_speed = data.get('wind', {}).get('speed', 0)
-            wind_deg = data.get('wind', {}).get('deg', 0)
-            temp = data.get('main', {}).get('temp', 0)
-            humidity = data.get('main', {}).get('humidity', 0)
-            rain = data.get('rain', {}).get('1h', 0) if 'rain' in data else 0
-            air_quality = "좋음"  # 기본값
-
-        except (requests.exceptions.RequestException, ValueError) as e:
-            print(f"API 오류 발생: {str(e)}")
-            print("더미 데이터를 사용합니다.")
-            # 더미 데이터 사용
-            wind_speed = 5.2
-            wind_deg = 180
-            temp = 25.6
-            humidity = 65
-            rain = 0
-            air_quality = "좋음"
+    def apply_weather(self, payload):
+        if payload['name'] != WEATHER_LOCATION:
+            return
+        weather = payload['weather']
+        wind_speed = weather['wind_speed']
+        wind_deg = weather['wind_deg']
+        temp = weather['temp']
+        humidity = weather['humidity']
+        rain = weather['rain']
+        air_quality = weather['air_quality']
+
+        # 조회에 실패해 이전 값/기본값을 표시 중이면 제목에 표시
+        title = f"기상 정보 ({WEATHER_LOCATION_LABEL})"
+        self.weather_box.setTitle(title + (" - 갱신 지연" if payload['stale'] else ""))
 
         # 풍향 계산
         wind_dir = self.deg_to_direction(wind_deg)
@@ -497,7 +640,11 @@ class DashboardTab(QWidget):
             'slope': 15,     # 기본값
             'damage_class': 2  # 기본값
         }
-        self.update_risk_assessment(risk_factors)
+        if self.backend_ready:
+            self.update_risk_assessment(risk_factors)
+        else:
+            # 시작 직후에는 GUI 스레드에서 무거운 모듈을 불러오지 않도록 미리 불러오기 완료까지 대기
+            self.pending_risk_factors = risk_factors
 
     def deg_to_direction(self, deg):
         directions = ['북', '북동', '동', '남동', '남', '남서', '서', '북서']
@@ -527,31 +674,72 @@ class DashboardTab(QWidget):
 
 
 class MapTab(QWidget):
+    """
+    지도 페이지는 한 번만 로드하고, 이후에는 runJavaScript로 바뀐 피처만 전달
+    (페이지를 다시 불러오지 않으므로 Leaflet/타일 재다운로드가 없고 사용자의 확대/이동 상태가 유지됨)
+    """
     def __init__(self):
         super().__init__()
         layout = QVBoxLayout()
+        self.page_ready = False
+        self.pending_scripts = []
+        self.layer_features = {}  # 레이어 이름 -> {피처 id: 마지막으로 보낸 피처}
 
-        m = folium.Map(location=[35.1767, 128.1035], zoom_start=14)
-        folium.Marker(location=[35.1767, 128.1035], tooltip="가좌동").add_to(m)
-        folium.CircleMarker(location=[35.18, 128.10], radius=30, color='red', fill=True, fill_opacity=0.5, popup="화재 위험 지역").add_to(m)
-
-        map_path = os.path.abspath(os.path.join(MAP_DIR, "map.html"))
-        m.save(map_path)
-        print(f"기본 지도 파일이 저장되었습니다: {map_path}")
+        map_path = write_live_map(os.path.abspath(os.path.join(MAP_DIR, "live_map.html")), 35.1767, 128.1035, zoom=14)
 
         self.web_view = QWebEngineView()
+        self.web_view.loadFinished.connect(self.on_load_finished)
         self.web_view.load(QUrl.fromLocalFile(map_path))
         layout.addWidget(self.web_view)
 
         self.setLayout(layout)
 
-    def load_scenario_map(self, scenario_id):
-        map_path = os.path.abspath(os.path.join(MAP_DIR, f"scenario_{scenario_id}_map.html"))
-        if os.path.exists(map_path):
-            self.web_view.load(QUrl.fromLocalFile(map_path))
-            print(f"시나리오 지도를 로드했습니다: {map_path}")
+        # 기본 표시 (가좌동, 화재 위험 지역)
+        self.push_features('default', feature_collection([
+            point_feature('gajwa', 35.1767, 128.1035, kind='marker', tooltip="가좌동"),
+            point_feature('risk-area', 35.18, 128.10, kind='circle', radius=300, color='red',
+                          fill_opacity=0.5, popup="화재 위험 지역"),
+        ]), fit=False)
+
+    def on_load_finished(self, ok):
+        if not ok:
+            print("지도 페이지 로드 실패")
+            return
+        self.page_ready = True
+        for script in self.pending_scripts:
+            self.web_view.page().runJavaScript(script)
+        self.pending_scripts = []
+
+    def run_script(self, script):
+        # 페이지 로드 전 호출은 모아 두었다가 로드 완료 시 실행
+        if self.page_ready:
+            self.web_view.page().runJavaScript(script)
         else:
-            print(f"지도 파일을 찾을 수 없습니다: {map_path}")
+            self.pending_scripts.append(script)
+
+    def push_features(self, name, collection, fit=None):
+        """이전에 보낸 피처와 비교해 추가/변경된 피처와 삭제된 id만 전달 (처음 그리는 레이어는 화면을 맞춤)"""
+        previous = self.layer_features.get(name, {})
+        current = {feature['id']: feature for feature in collection['features']}
+        changed = [feature for feature_id, feature in current.items() if previous.get(feature_id) != feature]
+        removed = [feature_id for feature_id in previous if feature_id not in current]
+        if fit is None:
+            fit = name not in self.layer_features
+
+        if removed:
+            self.run_script(js_call('removeFeatures', name, removed))
+        if changed or fit:
+            self.run_script(js_call('updateFeatures', name, feature_collection(changed), fit))
+        self.layer_features[name] = current
+        return len(changed), len(removed)
+
+    def remove_layer(self, name):
+        self.layer_features.pop(name, None)
+        self.run_script(js_call('removeLayer', name))
+
+    def show_resource_allocations(self, scenario_id, features):
+        changed, removed = self.push_features('allocation', features)
+        print(f"시나리오 {scenario_id} 배치 지도 갱신: 변경 {changed}개, 삭제 {removed}개")
 
 
 class ResourceManagementTab(QWidget):
@@ -559,7 +747,6 @@ class ResourceManagementTab(QWidget):
         super().__init__()
         self.initUI()
         self.load_current_resources()
-        self.loop = None
 
     def initUI(self):
         layout = QVBoxLayout()
@@ -666,95 +853,34 @@ class ResourceManagementTab(QWidget):
         if hasattr(self, 'dashboard_tab'):
             self.dashboard_tab.update_resource_status()
 
-    def update_resource_locations(self, results):
-        """자원 배치 결과에 따라 위치 정보 업데이트"""
+    def fetch_resource_addresses(self, results):
+        """배치 좌표들의 주소 조회 (결과를 기다리므로 작업 스레드에서 호출)"""
         try:
-            # 새로운 이벤트 루프 생성
-            self.loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self.loop)
-            
-            # 비동기 작업 실행
-            self.loop.run_until_complete(self._async_update_resource_locations(results))
+            return get_geocoding_service().reverse_many(
+                [(result['latitude'], result['longitude']) for result in results])
         except Exception as e:
             print(f"자원 위치 업데이트 중 오류 발생: {e}")
-        finally:
-            # 이벤트 루프 정리
-            if self.loop:
-                try:
-                    self.loop.close()
-                except Exception as e:
-                    print(f"이벤트 루프 종료 중 오류 발생: {e}")
-                self.loop = None
-
-    async def _async_update_resource_locations(self, results):
-        """자원 배치 결과에 따라 위치 정보 업데이트 (비동기)"""
-        try:
-            # 모든 좌표에 대한 주소 요청 태스크 생성
-            tasks = []
-            for result in results:
-                lon = result['longitude']
-                lat = result['latitude']
-                tasks.append(self.get_road_address_from_coords(lon, lat))
-        
-            # 모든 주소를 병렬로 조회
-            addresses = await asyncio.gather(*tasks)
-        
-            # 테이블 업데이트
-            address_idx = 0
-            for result in results:
-                for row in range(self.table.rowCount()):
-                    resource_name = self.table.item(row, 0).text()
-                    # 소방차 처리
-                    if f"소방차 {result['type']}" in resource_name:
-                        self.table.setItem(row, 1, QTableWidgetItem(f"배치 완료 ({result['quantity']}대)"))
-                        self.table.setItem(row, 2, QTableWidgetItem(addresses[address_idx]))
-                        address_idx += 1
-                    # 인력 처리
-                    elif f"인력 {result['type']}" in resource_name:
-                        self.table.setItem(row, 1, QTableWidgetItem(f"배치 완료 ({result['quantity']}명)"))
-                        self.table.setItem(row, 2, QTableWidgetItem(addresses[address_idx]))
-                        address_idx += 1
-        except Exception as e:
-            print(f"비동기 위치 업데이트 중 오류 발생: {e}")
-
-    async def get_road_address_from_coords(self, lon, lat):
-        """좌표로부터 도로 주소를 가져오는 비동기 함수"""
-        url = "https://nominatim.openstreetmap.org/reverse"
-        params = {
-            "lat": lat,
-            "lon": lon,
-            "format": "json",
-            "zoom": 18,
-            "accept-language": "ko"
-        }
-        headers = {"User-Agent": "AIWRS/Beta1.0 (moongijun967@gmail.com)"}
-        
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, headers=headers, timeout=5) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        address = data.get('address', {})
-                        road = address.get('road', '')
-                        suburb = address.get('suburb', '')
-                        city = address.get('city', '')
-                        country = address.get('country', '')
-                        return f"{country} {city} {suburb} {road}" if road else "주소 없음"
-                    else:
-                        return f"API 오류: {response.status}"
-        except Exception as e:
-            print(f"주소 조회 중 오류 발생: {e}")
-            return "주소 조회 실패"
+            return None
 
-    def closeEvent(self, event):
-        """위젯이 닫힐 때 이벤트 루프 정리"""
-        if self.loop:
-            try:
-                self.loop.close()
-            except Exception as e:
-                print(f"이벤트 루프 종료 중 오류 발생: {e}")
-            self.loop = None
-        super().closeEvent(event)
+    def apply_resource_locations(self, results, addresses):
+        """조회된 주소로 자원 테이블 갱신 (GUI 스레드)"""
+        if not addresses:
+            return
+        # 테이블 업데이트
+        address_idx = 0
+        for result in results:
+            for row in range(self.table.rowCount()):
+                resource_name = self.table.item(row, 0).text()
+                # 소방차 처리
+                if f"소방차 {result['type']}" in resource_name:
+                    self.table.setItem(row, 1, QTableWidgetItem(f"배치 완료 ({result['quantity']}대)"))
+                    self.table.setItem(row, 2, QTableWidgetItem(addresses[address_idx]))
+                    address_idx += 1
+                # 인력 처리
+                elif f"인력 {result['type']}" in resource_name:
+                    self.table.setItem(row, 1, QTableWidgetItem(f"배치 완료 ({result['quantity']}명)"))
+                    self.table.setItem(row, 2, QTableWidgetItem(addresses[address_idx]))
+                    address_idx += 1
 
     def connect_dashboard(self, dashboard_tab):
         """대시보드 탭과 연결"""
@@ -798,56 +924,88 @@ class HistoryTab(QWidget):
     def __init__(self):
         super().__init__()
         self.layout = QVBoxLayout()
+        self.model = None
 
-        self.log_view = QTextEdit()
-        self.log_view.setReadOnly(True)
+        # 이벤트가 많아도 보이는 범위만 그리도록 표 뷰 사용 (스크롤 끝에서 다음 페이지 조회)
+        self.log_view = QTableView()
+        self.log_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.log_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.log_view.verticalHeader().setVisible(False)
+        self.log_view.horizontalHeader().setStretchLastSection(True)
 
+        self.all_dates = QCheckBox("전체 기간")
         self.date_filter = QDateEdit()
         self.date_filter.setCalendarPopup(True)
         self.date_filter.setDate(QDate.currentDate())
+        self.all_dates.toggled.connect(self.date_filter.setDisabled)
 
         self.severity_filter = QComboBox()
-        self.severity_filter.addItems(["전체", "낮음", "보통", "높음", "심각"])
+        self.severity_filter.addItems(["전체", "매우 낮음", "낮음", "보통", "높음", "심각"])
+
+        self.scenario_filter = QLineEdit()
+        self.scenario_filter.setPlaceholderText("전체")
+        self.scenario_filter.returnPressed.connect(self.load_logs)
 
         filter_layout = QHBoxLayout()
         filter_layout.addWidget(QLabel("날짜:"))
         filter_layout.addWidget(self.date_filter)
+        filter_layout.addWidget(self.all_dates)
         filter_layout.addWidget(QLabel("위험도:"))
         filter_layout.addWidget(self.severity_filter)
+        filter_layout.addWidget(QLabel("시나리오:"))
+        filter_layout.addWidget(self.scenario_filter)
 
+        self.count_label = QLabel("")
         self.refresh_button = QPushButton("기록 조회")
         self.refresh_button.clicked.connect(self.load_logs)
 
         self.layout.addLayout(filter_layout)
         self.layout.addWidget(self.log_view)
+        self.layout.addWidget(self.count_label)
         self.layout.addWidget(self.refresh_button)
         self.setLayout(self.layout)
 
     def connect_dashboard(self, dashboard: DashboardTab):
         self.dashboard = dashboard
+        self.model = EventTableModel(dashboard.event_store, parent=self)
+        self.log_view.setModel(self.model)
+        dashboard.event_store.written.connect(self.on_events_written)
+        self.load_logs()
+
+    def current_filters(self):
+        return {
+            'date': None if self.all_dates.isChecked() else self.date_filter.date().toString("yyyy-MM-dd"),
+            'severity': self.severity_filter.currentText(),
+            'scenario_id': self.scenario_filter.text().strip() or None,
+        }
 
     def load_logs(self):
-        if hasattr(self, "dashboard"):
-            selected_date = self.date_filter.date().toString("yyyy-MM-dd")
-            selected_level = self.severity_filter.currentText()
-
-            filtered_logs = []
-            for log in self.dashboard.fire_logs:
-                date_match = selected_date in log
-                level_match = True
-                if selected_level != "전체":
-                    level_match = selected_level in log
-                if date_match and level_match:
-                    filtered_logs.append(log)
-
-            self.log_view.setPlainText("\n".join(filtered_logs))
-        else:
-            self.log_view.setPlainText("대시보드 연결 실패")
+        if self.model is None:
+            self.count_label.setText("대시보드 연결 실패")
+            return
+        try:
+            self.model.set_filters(**self.current_filters())
+        except Exception as e:
+            print(f"기록 조회 중 오류 발생: {e}")
+            self.count_label.setText(f"기록 조회 실패: {e}")
+            return
+        self.update_count_label()
 
-import cv2
-import code.videoProcess.videoProcess as vP
-from PyQt5.QtCore import pyqtSignal
-import time
+    def on_events_written(self, last_id):
+        # 새로 저장된 기록 중 현재 조건에 맞는 것만 위에 추가 (불러온 페이지는 유지)
+        try:
+            self.model.append_newer()
+        except Exception as e:
+            print(f"기록 갱신 중 오류 발생: {e}")
+            return
+        self.update_count_label()
+
+    def update_count_label(self):
+        self.count_label.setText(f"조건에 맞는 기록 {self.model.total}건")
+
+from PyQt5.QtCore import QThread
+
+DEFAULT_REFRESH_RATE = 60.0  # 화면 주사율을 알 수 없을 때 사용할 최대 표시 빈도
 
 class VideoTab(QWidget):
     # confidence 값과 감지된 프레임을 전달 신호 (클래스 변수)
@@ -857,14 +1015,22 @@ class VideoTab(QWidget):
     def __init__(self, status_bar=None):
         super().__init__()
         self.status_bar = status_bar
+        # 영상 처리 모듈(cv2, skimage, torch)은 탭을 처음 열 때 불러옴
+        from code.Front.videoWorker import FrameMailbox
         self.video_thread = None
+        self.worker = None
+        self.profiler = None
+        self.mailbox = FrameMailbox()
         self.layout = QVBoxLayout()
 
         self.is_analyzing = False
-        self.fire_detected_time = None
 
         self.video_player = QLabel(parent=self)
 
+        # 작업 스레드가 그린 최신 프레임을 화면 주사율 간격으로만 가져와 표시 (중간 프레임은 버림)
+        self.display_timer = QTimer(self)
+        self.display_timer.timeout.connect(self.show_latest_frame)
+
         btn_layout = QHBoxLayout()
         btn_layout.addStretch(stretch=1)  # 오른쪽 정렬
 
@@ -875,6 +1041,11 @@ class VideoTab(QWidget):
         self.analyze_btn.clicked.connect(self.analyze_video)
         btn_layout.addWidget(self.analyze_btn)
 
+        self.stop_btn = QPushButton("분석 중지")
+        self.stop_btn.clicked.connect(self.stop_analysis)
+        self.stop_btn.setEnabled(False)
+        btn_layout.addWidget(self.stop_btn)
+
         self.delete_btn = QPushButton("영상 삭제")
         self.delete_btn.clicked.connect(self.delete_video)
         btn_layout.addWidget(self.delete_btn)
@@ -885,80 +1056,107 @@ class VideoTab(QWidget):
 
     def stop_analysis(self):
         self.is_analyzing = False
+        if self.worker is not None:
+            self.worker.stop()
+
+    def wait_analysis(self, timeout_ms=3000):
+        """분석 스레드를 멈추고 종료될 때까지 대기 (앱 종료 시 사용)"""
+        self.stop_analysis()
+        if self.video_thread is not None:
+            self.video_thread.quit()
+            self.video_thread.wait(timeout_ms)
 
     def analyze_video(self):
+        if self.video_thread is not None:
+            self.status_bar.showMessage("이미 영상을 분석 중입니다.")
+            return
+
         fname, _ = QFileDialog.getOpenFileName(self, "Open Video", "", "Video Files (*.mp4 *.avi)")
         if not fname:
             self.status_bar.showMessage("영상 파일을 선택해주세요.")
             return
-        
-        self.cap = cv2.VideoCapture(fname)
         self.is_analyzing = True
-        self.fire_detected_time = None # 타이머 초기화
-        self.is_fire_in_frame = False
-
-        width = self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)
-        height = self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
-        self.video_player.resize(int(width), int(height))
 
-        if self.cap is None:
-            self.status_bar.showMessage("영상 파일 읽기 실패")
+        # 영상 읽기와 추론은 별도 스레드의 작업 객체에서 수행 (GUI 스레드는 표시만 담당)
+        # 화재 감지 모델은 미리 불러오기 또는 작업 스레드에서 처음 사용할 때 로드
+        from code.Front.videoWorker import VideoAnalysisWorker
+        from code.videoProcess.profiler import StageProfiler
+        # 작업 스레드의 단계와 GUI 스레드의 표시(display) 단계를 한 프로파일러에 기록
+        self.profiler = StageProfiler(os.path.basename(fname))
+        self.video_thread = QThread(self)
+        self.worker = VideoAnalysisWorker(fname, self.mailbox, profiler=self.profiler)
+        self.worker.moveToThread(self.video_thread)
+        self.video_thread.started.connect(self.worker.run)
+        self.worker.fire_confirmed.connect(self.on_fire_confirmed)
+        self.worker.status.connect(self.status_bar.showMessage)
+        self.worker.finished.connect(self.on_analysis_finished)
+        self.worker.finished.connect(self.video_thread.quit)
+        self.video_thread.finished.connect(self.worker.deleteLater)
+        self.video_thread.finished.connect(self.on_thread_finished)
+
+        self.analyze_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self.status_bar.showMessage(f"영상 분석 시작: {os.path.basename(fname)}")
+        self.display_timer.start(self.display_interval())
+        self.video_thread.start()
+
+    def display_interval(self):
+        """화면 주사율에 맞춘 표시 간격 (ms)"""
+        screen = QGuiApplication.primaryScreen()
+        refresh_rate = screen.refreshRate() if screen is not None else 0
+        return max(1, int(1000 / (refresh_rate or DEFAULT_REFRESH_RATE)))
+
+    def show_latest_frame(self):
+        latest = self.mailbox.acquire()
+        if latest is None:
             return
-        
-        while self.is_analyzing:
-            ret, frame = self.cap.read()
-            if not ret:
-                break
-
-            # 전처리 수행 (화재 색상 및 텍스처 분석)
-            processed = vP.preprocessing(frame)
-
-            # YOLO 모델로 화재 감지 수행
-            detection_result = fire_model(frame)
-            self.is_fire_in_frame = False
-
-            for result in detection_result:
-                boxes = result.boxes
-                for box in boxes:
-                    if box.conf[0] > 0.23:
-                        self.FIRE_SIGNAL.emit(box.conf, frame)
-                        self.is_fire_in_frame = True
-                        break
-                break
-
-            if self.is_fire_in_frame:
-                if self.fire_detected_time is None:
-                    # 화재가 처음 감지되면 시간 기록
-                    self.fire_detected_time = time.time()
-                
-                # 3초 이상 감지가 지속되었는지 확인
-                elif time.time() - self.fire_detected_time > 3:
-                    print("화재 발생 확정. 영상 분석을 종료하고 시뮬레이션을 시작합니다.")
-                    self.is_analyzing = False  # <--- 루프 종료 플래그
-                    self.CONF_SIGNAL.emit() # <--- 메인 윈도우에 신호 전송
+        frame, detections = latest
+        started = time.perf_counter()
+        try:
+            h, w, ch = frame.shape
+            # BGR 메모리를 그대로 감싸고, QPixmap 변환 시 한 번만 복사 (Qt 5.14 미만은 색 변환 필요)
+            if hasattr(QImage, 'Format_BGR888'):
+                qImg = QImage(frame.data, w, h, frame.strides[0], QImage.Format_BGR888)
             else:
-                # 화재가 감지되지 않으면 타이머 리셋
-                self.fire_detected_time = None
-            
-            # 원본 프레임과 처리된 프레임을 가로로 결합
-            combined_frame = np.hstack((frame, processed))
-            frame = combined_frame
-            
-            
-            # 화재 감지 결과 시각화
-            frame = vP.visualize_fire_detection(frame, detection_result)
-
-            img = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = img.shape
-            qImg = QImage(img.data, w, h, ch*w, QImage.Format_RGB888)
+                import cv2
+                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                qImg = QImage(rgb.data, w, h, ch*w, QImage.Format_RGB888)
             self.pixmap = QPixmap.fromImage(qImg)
-            self.video_player.setPixmap(self.pixmap)
-            cv2.waitKey(int(self.cap.get(cv2.CAP_PROP_FPS)))
+        finally:
+            self.mailbox.release()
+        if self.video_player.width() != w or self.video_player.height() != h:
+            self.video_player.resize(w, h)
+        self.video_player.setPixmap(self.pixmap)
+        if self.profiler is not None:
+            self.profiler.record('display', time.perf_counter() - started)
+
+    def on_fire_confirmed(self, event, frame):
+        self.FIRE_SIGNAL.emit(event['confidence'], frame)
+        # 첫 확정 한 번만 메인 윈도우에 신호 전송 (같은 분석에서 중복 실행 방지)
+        if self.is_analyzing:
+            self.is_analyzing = False
+            self.CONF_SIGNAL.emit()
+
+    def on_analysis_finished(self, stats):
+        self.is_analyzing = False
+        if stats and self.status_bar:
+            self.status_bar.showMessage(
+                f"분석 종료 - YOLO 추론 생략 비율 {stats['gate_skip_ratio'] * 100:.1f}%, "
+                f"건너뛴 프레임 {stats['skipped']}개, 평균 처리 시간 {stats['processing_ms']}ms"
+            )
 
-        self.cap.release()
+    def on_thread_finished(self):
+        # 마지막 프레임까지 표시한 뒤 표시 타이머 정지
+        self.show_latest_frame()
+        self.display_timer.stop()
+        self.video_thread.deleteLater()
+        self.video_thread = None
+        self.worker = None
+        self.analyze_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
 
     def delete_video(self):
-        self.cap.release()
+        self.stop_analysis()
         self.video_player.clear()
         self.status_bar.showMessage("영상 삭제 완료")
 
@@ -2,6 +2,7 @@ from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5 import uic
 import sys
+import math
 
 # 필요한 모듈 임포트 (기존 코드와 동일)
 from code.test.fireSpread.fireSpread import FireSpreadSimulator
@@ -25,6 +26,15 @@ class IndexPopup(QDialog):
         self.sim = None
         self.timer = QTimer(self)
 
+    def update_weather(self, payload):
+        """기상 정보 갱신을 다음 시뮬레이션의 풍속/풍향/습도에 반영"""
+        weather = payload['weather']
+        self.scenario['wind_speed'] = weather['wind_speed']
+        self.scenario['humidity'] = weather['humidity']
+        # 풍향(바람이 불어오는 방위각)을 불어가는 방향의 격자 벡터로 변환 (북풍 = (0, 1))
+        rad = math.radians(weather['wind_deg'])
+        self.scenario['wind_direction'] = (-math.sin(rad), math.cos(rad))
+
     def setupUi(self, Dialog):
         Dialog.setObjectName("Dialog")
         Dialog.resize(600, 500)
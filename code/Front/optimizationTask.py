@@ -0,0 +1,150 @@
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from code.test.LinearProgramming.respondFireConfigure import generate_scenarios_from_data
+from code.test.LinearProgramming.respondFireConfigure import ResourceAllocator
+from code.test.LinearProgramming.respondFireConfigure import RiskCalculator
+from code.test.LinearProgramming.respondFireConfigure import load_and_preprocess_data_for_scenario
+from code.Map.liveMap import resource_allocation_features
+
+FIRE_DATA_PATH = './datasets/WSQ000301.csv'
+
+# (진행률, 단계 이름)
+STAGES = {
+    'load': (10, "화재 데이터 로드 중"),
+    'scenario': (30, "시나리오 생성 중"),
+    'optimize': (50, "자원 배치 최적화 중"),
+    'risk': (70, "위험도 계산 중"),
+    'map': (80, "지도 피처 생성 중"),
+    'geocode': (90, "배치 위치 주소 조회 중"),
+    'done': (100, "최적화 완료"),
+}
+
+class OptimizationCancelled(Exception):
+    pass
+
+class OptimizationSignals(QObject):
+    # QRunnable은 QObject가 아니므로 시그널은 별도 객체에 둠
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+def summarize_risk(scenario, risk_calculator):
+    """시나리오의 사이트별 위협 목록, 평균 위험도, 평균 위험 요인 계산"""
+    threat_list = []
+    total_risk_score_sum = 0.0
+    risk_factor_sums = {'wind_speed': 0.0, 'humidity': 0.0, 'slope': 0.0}
+    fuel_types = []
+    damage_classes = []
+
+    for site_id, site_info in scenario.sites.items():
+        risk_factors = site_info['risk_factors']
+        risk_score = risk_calculator.calculate_risk_score(risk_factors)
+        risk_level = risk_calculator.get_risk_level(risk_score)
+        threat_list.append(f"위치 {site_id}: {risk_level} ({risk_score}%) - 예상 피해면적 {site_info.get('predicted_damage_area_ha', 0.0):.2f}ha")
+        total_risk_score_sum += risk_score
+
+        # 평균 위험 요인 계산을 위한 데이터 누적
+        for key in risk_factor_sums:
+            try: risk_factor_sums[key] += float(risk_factors.get(key, 0.0))
+            except ValueError: pass
+        fuel_types.append(str(risk_factors.get('fuel_type', 'Unknown')))
+        damage_classes.append(str(risk_factors.get('damage_class', 'Unknown')))
+
+    num_sites = len(scenario.sites)
+    avg_risk_factors = {}
+    if num_sites > 0:
+        for key, total in risk_factor_sums.items():
+            avg_risk_factors[key] = total / num_sites
+        # 범주형 변수는 최빈값 또는 가장 위험한 값 등으로 처리 (여기서는 간단히 첫 번째 값 사용)
+        avg_risk_factors['fuel_type'] = fuel_types[0] if fuel_types else 'Unknown'
+        avg_risk_factors['damage_class'] = damage_classes[0] if damage_classes else 'Unknown'
+
+    return {
+        'threat_list': threat_list,
+        'avg_risk_score': total_risk_score_sum / num_sites if num_sites else 0.0,
+        'avg_risk_factors': avg_risk_factors,
+    }
+
+class OptimizationTask(QRunnable):
+    """
+    데이터 로드 → 시나리오 생성 → CBC 최적화 → 지도 피처 생성 → 주소 조회를 QThreadPool에서 수행
+    - 단계마다 progress 시그널 전송, 단계 사이에서 취소 확인 (CBC 풀이 중에는 끝날 때까지 대기)
+    - 위젯은 건드리지 않고 결과를 finished(dict)로 GUI 스레드에 전달
+    """
+    def __init__(self, truck_settings, personnel_settings, geocoder=None, data_path=FIRE_DATA_PATH):
+        super().__init__()
+        self.truck_settings = truck_settings
+        self.personnel_settings = personnel_settings
+        self.geocoder = geocoder
+        self.data_path = data_path
+        self.signals = OptimizationSignals()
+        self.is_cancelled = False
+        # 완료 후 시그널 객체가 먼저 삭제되지 않도록 자동 삭제는 끔 (GUI가 참조 보관)
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        self.is_cancelled = True
+
+    def stage(self, name):
+        if self.is_cancelled:
+            raise OptimizationCancelled()
+        percent, label = STAGES[name]
+        self.signals.progress.emit(percent, label)
+
+    def run(self):
+        try:
+            result = self.optimize()
+        except OptimizationCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            print(f"자원 최적화 중 오류 발생: {e}")
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+    def optimize(self):
+        # 데이터 로드 및 전처리
+        self.stage('load')
+        df_processed = load_and_preprocess_data_for_scenario(self.data_path)
+        if df_processed is None:
+            raise RuntimeError("데이터 로드 오류")
+
+        # 시나리오 생성
+        self.stage('scenario')
+        scenarios = generate_scenarios_from_data(df_processed)
+        if not scenarios:
+            raise RuntimeError("시나리오가 생성되지 않음")
+
+        # 첫 번째 시나리오 선택
+        scenario = scenarios[0]
+        result = {'scenario': scenario, 'results': [], 'cost': 0.0, 'map_features': None, 'addresses': None}
+        if not scenario.sites:
+            self.stage('done')
+            return result
+
+        # 자원 관리 탭의 설정을 반영해 최적화 수행
+        self.stage('optimize')
+        allocator = ResourceAllocator()
+        for truck_type, qty in self.truck_settings.items():
+            allocator.set_resource_deployment('truck', truck_type, qty)
+        for personnel_type, qty in self.personnel_settings.items():
+            allocator.set_resource_deployment('firefighter', personnel_type, qty)
+        results, cost = allocator.optimize_single_scenario(scenario)
+        result['results'] = results
+        result['cost'] = cost
+
+        self.stage('risk')
+        result.update(summarize_risk(scenario, RiskCalculator()))
+
+        if results:
+            # 지도에 보낼 GeoJSON 피처 생성 (지도 페이지는 다시 만들지 않음)
+            self.stage('map')
+            result['map_features'] = resource_allocation_features(scenario.base_station, results)
+
+            if self.geocoder is not None:
+                self.stage('geocode')
+                result['addresses'] = self.geocoder(results)
+
+        self.stage('done')
+        return result
@@ -0,0 +1,201 @@
+import os
+import threading
+
+import numpy as np
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+
+import code.videoProcess.videoProcess as vP
+from code.videoProcess.gating import InferenceGate
+from code.videoProcess.rateControl import AdaptiveRateController
+from code.videoProcess.tracker import FireTracker, extract_detections
+from code.videoProcess.profiler import StageProfiler
+from code.videoProcess.frameSource import FrameSource
+
+PROFILE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'profiles')
+PROFILE_STATUS_INTERVAL = 30  # 이 프레임 수마다 상태 표시줄에 단계별 지연 표시
+# 상태 표시줄에 보여줄 단계 (display는 GUI 스레드의 QImage/QPixmap 변환, VideoTab이 같은 프로파일러에 기록)
+STATUS_STAGES = ['preprocess', 'yolo', 'visualize', 'display']
+
+class FrameMailbox:
+    """
+    작업 스레드가 그리고 GUI 스레드가 화면 갱신 주기마다 가져가는 삼중 버퍼
+    - 버퍼는 미리 할당해 재사용 (프레임마다 새 배열을 만들지 않음)
+    - GUI가 가져가기 전에 새 프레임이 오면 이전 프레임은 버림
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buffers = []
+        self.shape = None
+        self.writing = 0
+        self.latest = None  # 표시를 기다리는 최신 버퍼 번호
+        self.reading = None  # GUI 스레드가 읽는 중인 버퍼 번호
+        self.detections = []
+        self.published = 0
+        self.dropped = 0
+
+    def canvas(self, shape):
+        """작업 스레드: 이번 프레임을 그릴 버퍼 (표시 대기/표시 중인 버퍼와 겹치지 않음)"""
+        with self.lock:
+            if self.shape != shape:
+                # 크기가 바뀌면 새로 할당 (GUI가 읽는 중인 이전 배열은 참조가 남아 안전)
+                self.buffers = [np.empty(shape, dtype=np.uint8) for _ in range(3)]
+                self.shape = shape
+                self.latest = None
+                self.reading = None
+            self.writing = next(i for i in range(3) if i != self.latest and i != self.reading)
+            return self.buffers[self.writing]
+
+    def publish(self, detections):
+        """작업 스레드: 그리기가 끝난 버퍼를 최신 프레임으로 등록"""
+        with self.lock:
+            if self.latest is not None:
+                self.dropped += 1
+            self.latest = self.writing
+            self.detections = detections
+            self.published += 1
+
+    def acquire(self):
+        """GUI 스레드: 새 프레임이 있으면 (버퍼, 감지 목록), 없으면 None"""
+        with self.lock:
+            if self.latest is None:
+                return None
+            self.reading, self.latest = self.latest, None
+            return self.buffers[self.reading], self.detections
+
+    def release(self):
+        with self.lock:
+            self.reading = None
+
+class VideoAnalysisWorker(QObject):
+    """
+    영상 읽기/전처리/YOLO 추론을 QThread에서 수행하는 작업 객체
+    GUI 스레드와는 시그널(큐 연결)로만 통신하며, 감지 결과는 작은 dict/list로 전달
+    표시할 프레임은 시그널 대신 FrameMailbox에 그려 두고 GUI가 화면 갱신 주기마다 가져감
+    """
+    # 확정 이벤트 요약(FireTrack.to_event)과 확정 당시 원본 프레임
+    fire_confirmed = pyqtSignal(dict, np.ndarray)
+    status = pyqtSignal(str)
+    # 분석 종료 통계 (게이트/프레임 건너뛰기/처리 시간)
+    finished = pyqtSignal(dict)
+
+    def __init__(self, path, mailbox, model=None, stop_on_confirm=True, profiler=None, target_fps=None):
+        super().__init__()
+        # 초당 분석 프레임 수 상한 (None이면 원본 fps, 처리 시간에 맞춘 조절은 AdaptiveRateController가 담당)
+        self.target_fps = target_fps
+        self.path = path
+        self.mailbox = mailbox
+        self.model = model
+        # GUI 스레드의 표시 단계도 함께 기록하도록 호출한 쪽에서 넘길 수 있음 (스레드 안전)
+        self.profiler = profiler
+        self.stop_on_confirm = stop_on_confirm
+        self._stop = threading.Event()
+
+    def stop(self):
+        """GUI 스레드에서 직접 호출 가능 (다음 프레임에서 루프 종료)"""
+        self._stop.set()
+
+    def is_stopped(self):
+        return self._stop.is_set()
+
+    @pyqtSlot()
+    def run(self):
+        # 모델/전처리 준비 중 예외가 나도 슬롯 밖으로 던지지 않고 finished로 스레드를 끝냄
+        source = None
+        preprocessor = None
+        profiler = None
+        gate = None
+        rate = None
+        try:
+            source = FrameSource(self.path)
+            if not source.is_opened():
+                self.status.emit("영상 파일 읽기 실패")
+                return
+
+            model = self.model if self.model is not None else vP.get_fire_model()
+            # 단계별 처리 시간 측정 (p50/p95/p99)
+            profiler = self.profiler if self.profiler is not None else StageProfiler(os.path.basename(self.path))
+            # 영상마다 독립된 전처리 상태(이전 프레임, 배경 모델) 사용
+            preprocessor = vP.FramePreprocessor(profiler=profiler)
+            # 색상/움직임이 없는 조용한 프레임은 YOLO 추론 생략
+            gate = InferenceGate()
+            # 처리 시간에 맞춰 프레임 간격과 추론 해상도를 조절 (실시간 유지)
+            rate = AdaptiveRateController(source.fps, self.target_fps)
+            # 화재 확정은 트랙의 감지 프레임 수와 영상 시각으로 판단
+            tracker = FireTracker()
+
+            self.analyze(source, model, profiler, preprocessor, gate, rate, tracker)
+        except Exception as e:
+            print(f"영상 분석 중 오류 발생: {e}")
+            self.status.emit(f"영상 분석 오류: {e}")
+        finally:
+            if preprocessor is not None:
+                preprocessor.close()
+            if source is not None:
+                source.release()
+            self.finished.emit(self.summarize(profiler, gate, rate))
+
+    def analyze(self, source, model, profiler, preprocessor, gate, rate, tracker):
+        while not self._stop.is_set():
+            ret, frame = source.read()
+            if not ret:
+                break
+            rate.begin_frame()
+            video_time = source.timestamp
+            frame_index = source.index
+
+            # 전처리 수행 (화재 색상 및 텍스처 분석)
+            preprocessor.process(frame)
+            processed = preprocessor.to_display()
+
+            # YOLO 모델로 화재 감지 수행 (게이트가 열린 프레임만)
+            detection_result = []
+            detections = []
+            if gate.should_infer(*preprocessor.gate_masks()):
+                with profiler.stage('yolo'):
+                    detection_result = model(frame, imgsz=rate.imgsz, verbose=False)
+                detections = extract_detections(detection_result)
+                gate.report(bool(detections))
+
+                # 트랙별로 확정 시 한 번만 신호 전송
+                confirmed = tracker.update(detections, frame_index, video_time)
+                for track in confirmed:
+                    print(f"화재 발생 확정 (트랙 {track.track_id}): {track.to_event()}")
+                    self.fire_confirmed.emit(track.to_event(), frame)
+                if confirmed and self.stop_on_confirm:
+                    print("영상 분석을 종료하고 시뮬레이션을 시작합니다.")
+                    self._stop.set()
+
+            # 원본 프레임과 처리된 프레임을 미리 할당된 캔버스에 나란히 복사 후 감지 결과 시각화
+            with profiler.stage('visualize'):
+                h, w = frame.shape[:2]
+                canvas = self.mailbox.canvas((h, w * 2, 3))
+                canvas[:, :w] = frame
+                canvas[:, w:] = processed
+                vP.visualize_fire_detection(canvas, detection_result, copy=False)
+            payload = [{'box': [round(v, 1) for v in box], 'confidence': round(conf, 3)}
+                       for box, conf in detections]
+            self.mailbox.publish(payload)
+            rate.end_frame()
+
+            if rate.processed % PROFILE_STATUS_INTERVAL == 0:
+                self.status.emit(profiler.status_text(STATUS_STAGES))
+
+            # 뒤처졌으면 프레임을 건너뛰고, 앞서 있으면 다음 프레임 시각까지 대기
+            skip, wait = rate.next_step(video_time)
+            source.skip(skip)
+            if wait > 0:
+                self._stop.wait(wait)
+
+    def summarize(self, profiler, gate, rate):
+        """종료 통계 (준비 단계에서 실패했으면 빈 dict)"""
+        if rate is None:
+            return {}
+        try:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            profiler.dump_json(os.path.abspath(os.path.join(PROFILE_DIR, 'video_profile.json')))
+        except OSError as e:
+            print(f"프로파일 저장 실패: {e}")
+        stats = rate.stats()
+        stats['gate_skip_ratio'] = gate.skip_ratio()
+        stats['display_dropped'] = self.mailbox.dropped
+        return stats
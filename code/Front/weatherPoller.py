@@ -0,0 +1,236 @@
+"""
+OpenWeatherMap 기상 정보를 백그라운드 스레드에서 주기적으로 조회하는 폴러
+- 위치별 TTL 캐시, 요청 타임아웃, 실패 시 이전 값(stale) 유지 후 다음 주기에 재시도
+- 한 주기에 여러 관측 지점을 하나의 세션으로 동시에 조회 (반올림한 좌표가 같으면 한 번만 요청)
+- 결과는 시그널로 대시보드/시뮬레이터에 전달 (GUI 스레드는 네트워크를 기다리지 않음)
+- 서버 주소는 WEATHER_API_URL 환경 변수나 base_url 인자로 바꿀 수 있음
+
+로컬 대체 서버 실행 후 조회 예:
+    python -m code.Front.weatherPoller --serve 8081
+    WEATHER_API_URL=http://127.0.0.1:8081/data/2.5/weather python -m code.Front.weatherPoller
+"""
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from PyQt5.QtCore import QObject, pyqtSignal
+
+WEATHER_API_URL = os.environ.get('WEATHER_API_URL', "http://api.openweathermap.org/data/2.5/weather")
+POLL_INTERVAL = 300  # 폴링 주기 (초) - 매 주기마다 TTL이 지난 위치만 다시 조회
+CACHE_TTL = 600  # 위치별 기상 정보 유효 기간 (초)
+REQUEST_TIMEOUT = (3, 5)  # (연결, 응답) 타임아웃 (초)
+MAX_CONCURRENT_REQUESTS = 4
+COORD_PRECISION = 3  # 소수점 3자리(약 100m) 단위로 같은 지점으로 봄
+STOP_TIMEOUT = 0.5  # 종료 시 폴링 스레드를 기다리는 최대 시간 (초, 데몬 스레드라 남아 있어도 종료됨)
+
+# API 오류 시 사용할 기본값 (기존 더미 데이터)
+DEFAULT_WEATHER = {
+    'wind_speed': 5.2,
+    'wind_deg': 180,
+    'temp': 25.6,
+    'humidity': 65,
+    'rain': 0,
+    'air_quality': "좋음",
+}
+
+def parse_weather(data):
+    """OpenWeatherMap 응답에서 필요한 값 추출"""
+    # API 응답 검증
+    if 'main' not in data or 'wind' not in data:
+        raise ValueError("필수 날씨 데이터가 누락되었습니다.")
+    return {
+        'wind_speed': data.get('wind', {}).get('speed', 0),
+        'wind_deg': data.get('wind', {}).get('deg', 0),
+        'temp': data.get('main', {}).get('temp', 0),
+        'humidity': data.get('main', {}).get('humidity', 0),
+        'rain': data.get('rain', {}).get('1h', 0) if 'rain' in data else 0,
+        'air_quality': "좋음",  # 기본값
+    }
+
+class WeatherPoller(QObject):
+    """
+    weather_updated(dict): {'name', 'lat', 'lon', 'weather', 'fetched_at', 'stale', 'source'}
+      - source: 'api'(새로 조회) / 'cache'(조회 실패로 이전 값 재전송) / 'default'(값이 없어 기본값 사용)
+    """
+    weather_updated = pyqtSignal(dict)
+    weather_failed = pyqtSignal(str)
+
+    def __init__(self, api_key, base_url=WEATHER_API_URL, interval=POLL_INTERVAL, ttl=CACHE_TTL,
+                 timeout=REQUEST_TIMEOUT, max_workers=MAX_CONCURRENT_REQUESTS):
+        super().__init__()
+        self.api_key = api_key
+        self.base_url = base_url
+        self.interval = interval
+        self.ttl = ttl
+        self.timeout = timeout
+        self.locations = {}  # 이름 -> (위도, 경도)
+        self.cache = {}  # 반올림 좌표 -> (조회 시각, 기상 정보)
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.stopped = threading.Event()
+        self.force = False
+        self.thread = None
+
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='weather')
+
+    def add_location(self, name, lat, lon):
+        with self.lock:
+            self.locations[name] = (lat, lon)
+        self.wake.set()
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self._run, name='weather-poller', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """GUI 종료를 막지 않도록 세션을 먼저 닫고 대기 중인 조회를 취소한 뒤 짧게만 기다림"""
+        self.stopped.set()
+        self.wake.set()
+        self.session.close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.thread is not None:
+            self.thread.join(STOP_TIMEOUT)
+            self.thread = None
+
+    def refresh_now(self):
+        """TTL과 상관없이 다음 주기를 바로 실행 (기다리지 않고 반환)"""
+        self.force = True
+        self.wake.set()
+
+    def get(self, name):
+        """
+        캐시된 값을 바로 반환 (없으면 None)
+        유효 기간이 지났으면 이전 값을 그대로 돌려주고 백그라운드에서 다시 조회
+        """
+        with self.lock:
+            if name not in self.locations:
+                return None
+            lat, lon = self.locations[name]
+            cached = self.cache.get(self.coord_key(lat, lon))
+        if cached is None:
+            self.wake.set()
+            return None
+        fetched_at, weather = cached
+        stale = time.time() - fetched_at > self.ttl
+        if stale:
+            self.wake.set()
+        return self.payload(name, lat, lon, weather, fetched_at, stale, 'cache')
+
+    @staticmethod
+    def coord_key(lat, lon):
+        return (round(lat, COORD_PRECISION), round(lon, COORD_PRECISION))
+
+    @staticmethod
+    def payload(name, lat, lon, weather, fetched_at, stale, source):
+        return {'name': name, 'lat': lat, 'lon': lon, 'weather': dict(weather),
+                'fetched_at': fetched_at, 'stale': stale, 'source': source}
+
+    def _run(self):
+        while not self.stopped.is_set():
+            force, self.force = self.force, False
+            self.wake.clear()
+            try:
+                self.poll(force)
+            except Exception as e:
+                # 종료 중에 취소된 조회는 오류로 보지 않음
+                if not self.stopped.is_set():
+                    print(f"기상 정보 폴링 중 오류 발생: {e}")
+            self.wake.wait(self.interval)
+
+    def poll(self, force=False):
+        """TTL이 지난 위치들을 한 번에 조회하고 위치별로 시그널 전송"""
+        now = time.time()
+        with self.lock:
+            locations = dict(self.locations)
+            cache = dict(self.cache)
+        due = {}
+        for name, (lat, lon) in locations.items():
+            key = self.coord_key(lat, lon)
+            cached = cache.get(key)
+            if force or cached is None or now - cached[0] > self.ttl:
+                due.setdefault(key, []).append(name)
+        if not due:
+            return
+
+        keys = list(due)
+        for key, (weather, error) in zip(keys, self.executor.map(self.fetch, keys)):
+            if self.stopped.is_set():
+                return
+            if weather is not None:
+                fetched_at = time.time()
+                with self.lock:
+                    self.cache[key] = (fetched_at, weather)
+                for name in due[key]:
+                    lat, lon = locations[name]
+                    self.weather_updated.emit(self.payload(name, lat, lon, weather, fetched_at, False, 'api'))
+                continue
+
+            print(f"API 오류 발생: {error}")
+            self.weather_failed.emit(error)
+            for name in due[key]:
+                lat, lon = locations[name]
+                if key in cache:
+                    # 이전 값을 유지하고 다음 주기에 다시 조회
+                    fetched_at, weather = cache[key]
+                    self.weather_updated.emit(self.payload(name, lat, lon, weather, fetched_at, True, 'cache'))
+                else:
+                    print("더미 데이터를 사용합니다.")
+                    self.weather_updated.emit(self.payload(name, lat, lon, DEFAULT_WEATHER, now, True, 'default'))
+
+    def fetch(self, key):
+        """(기상 정보, None) 또는 (None, 오류 메시지)"""
+        lat, lon = key
+        params = {'lat': lat, 'lon': lon, 'appid': self.api_key, 'units': 'metric', 'lang': 'kr'}
+        try:
+            response = self.session.get(self.base_url, params=params, timeout=self.timeout)
+            response.raise_for_status()  # HTTP 오류 확인
+            return parse_weather(response.json()), None
+        except (requests.exceptions.RequestException, ValueError) as e:
+            return None, str(e)
+
+def serve_stub(port=8081, weather=None):
+    """테스트용 OpenWeatherMap 대체 서버 (모든 좌표에 같은 값 응답)"""
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    weather = weather or DEFAULT_WEATHER
+    body = json.dumps({
+        'main': {'temp': weather['temp'], 'humidity': weather['humidity']},
+        'wind': {'speed': weather['wind_speed'], 'deg': weather['wind_deg']},
+        'rain': {'1h': weather['rain']},
+    }).encode('utf-8')
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = HTTPServer(('127.0.0.1', port), Handler)
+    print(f"기상 정보 대체 서버 실행: http://127.0.0.1:{port}/data/2.5/weather")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    import argparse
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    parser = argparse.ArgumentParser(description="기상 정보 조회")
+    parser.add_argument('--serve', type=int, default=None, metavar='PORT', help="대체 서버 실행")
+    parser.add_argument('--lat', type=float, default=35.1767)
+    parser.add_argument('--lon', type=float, default=128.1035)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve_stub(args.serve)
+    else:
+        poller = WeatherPoller(os.environ.get('WEATHER_API_KEY', ''))
+        print(poller.fetch(poller.coord_key(args.lat, args.lon)))
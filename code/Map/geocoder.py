@@ -0,0 +1,342 @@
+"""
+Nominatim 역지오코딩 서비스
+- 백그라운드 스레드의 이벤트 루프 하나와 aiohttp 세션 하나를 앱 전체에서 재사용
+- 좌표를 반올림해 같은 지점은 한 번만 요청 (동시에 들어온 요청도 합침)
+- SQLite TTL 캐시로 재시작 후에도 결과 재사용
+- Nominatim 이용 정책(초당 1회)에 맞춘 요청 간격 제한
+- 서버 주소는 GEOCODER_URL 환경 변수나 base_url 인자로 바꿀 수 있음 (로컬 테스트 서버용)
+- 오프라인 가제티어(offlineGeocoder)에서 먼저 찾고, 찾지 못한 좌표만 HTTP로 조회
+
+로컬 대체 서버 실행 후 조회 / 중복 합치기·캐시·요청 간격 확인 예:
+    python -m code.Map.geocoder --serve 8080
+    python -m code.Map.geocoder 35.1534 128.1128 --url http://127.0.0.1:8080/reverse
+    python -m code.Map.geocoder --check
+"""
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+
+from code.Map.offlineGeocoder import get_offline_geocoder
+
+NOMINATIM_URL = os.environ.get('GEOCODER_URL', "https://nominatim.openstreetmap.org/reverse")
+USER_AGENT = "AIWRS/Beta1.0 (moongijun967@gmail.com)"
+GEOCODE_CACHE_PATH = os.path.join(os.path.dirname(__file__), 'cache', 'geocode.sqlite')
+COORD_PRECISION = 4  # 소수점 4자리(약 11m) 단위로 같은 지점으로 봄
+CACHE_TTL = 30 * 24 * 3600  # 캐시 유효 기간 (초)
+MIN_REQUEST_INTERVAL = 1.0  # 요청 간 최소 간격 (초)
+REQUEST_TIMEOUT = 5
+LOOKUP_TIMEOUT = 60  # reverse_many 전체 대기 시간 (초)
+STUB_PORT = 8080  # 대체 서버 기본 포트
+CHECK_INTERVAL = 0.2  # --check에서 사용할 요청 간 최소 간격 (초)
+
+def format_address(data):
+    """Nominatim 응답을 '국가 시 동 도로' 형태로 변환"""
+    address = data.get('address', {})
+    road = address.get('road', '')
+    suburb = address.get('suburb', '')
+    city = address.get('city', '')
+    country = address.get('country', '')
+    return f"{country} {city} {suburb} {road}" if road else "주소 없음"
+
+def coord_key(lat, lon, precision=COORD_PRECISION):
+    return (round(float(lat), precision), round(float(lon), precision))
+
+class GeocodeCache:
+    """(위도, 경도) -> 주소 SQLite 캐시 (서비스의 이벤트 루프 스레드에서만 사용)"""
+    def __init__(self, path=GEOCODE_CACHE_PATH, ttl=CACHE_TTL):
+        self.ttl = ttl
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS geocode ("
+            "lat REAL NOT NULL, lon REAL NOT NULL, address TEXT NOT NULL, created REAL NOT NULL, "
+            "PRIMARY KEY (lat, lon))"
+        )
+        self.conn.commit()
+
+    def get(self, key):
+        row = self.conn.execute(
+            "SELECT address FROM geocode WHERE lat = ? AND lon = ? AND created >= ?",
+            (key[0], key[1], time.time() - self.ttl)
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key, address):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO geocode (lat, lon, address, created) VALUES (?, ?, ?, ?)",
+            (key[0], key[1], address, time.time())
+        )
+        self.conn.commit()
+
+    def purge(self):
+        """만료된 항목 삭제"""
+        self.conn.execute("DELETE FROM geocode WHERE created < ?", (time.time() - self.ttl,))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+class GeocodingService:
+    """
+    역지오코딩 서비스 (스레드 안전)
+    - reverse_many(): 결과가 나올 때까지 대기 (작업 스레드용)
+    - submit_many(): concurrent.futures.Future 반환 (기다리지 않음)
+    """
+    def __init__(self, base_url=NOMINATIM_URL, cache_path=GEOCODE_CACHE_PATH, ttl=CACHE_TTL,
+                 min_interval=MIN_REQUEST_INTERVAL, timeout=REQUEST_TIMEOUT, use_offline=True):
+        self.base_url = base_url
+        self.use_offline = use_offline
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.loop = None
+        self.thread = None
+        self.session = None
+        self.cache = None
+        self.inflight = {}  # 좌표 키 -> 진행 중인 요청 Future
+        self.next_request_time = 0.0
+        self.rate_lock = None
+        self.start_lock = threading.Lock()
+        self.requests_sent = 0
+        self.cache_hits = 0
+        self.offline_hits = 0
+
+    def start(self):
+        with self.start_lock:
+            if self.loop is not None:
+                return
+            self.loop = asyncio.new_event_loop()
+            self.thread = threading.Thread(target=self.loop.run_forever, name='geocoder', daemon=True)
+            self.thread.start()
+            # 루프 안에서 쓸 자원은 루프 스레드에서 생성
+            try:
+                asyncio.run_coroutine_threadsafe(self._setup(), self.loop).result()
+            except Exception:
+                self.loop.call_soon_threadsafe(self.loop.stop)
+                self.thread.join()
+                self.loop.close()
+                self.loop = None
+                raise
+
+    async def _setup(self):
+        import aiohttp
+        self.rate_lock = asyncio.Lock()
+        self.cache = GeocodeCache(self.cache_path, self.ttl)
+        self.cache.purge()
+        self.session = aiohttp.ClientSession(
+            headers={"User-Agent": USER_AGENT},
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            connector=aiohttp.TCPConnector(limit=2),
+        )
+
+    def submit_many(self, coords):
+        """[(위도, 경도), ...]의 주소 목록을 돌려줄 Future"""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(self._reverse_all(list(coords)), self.loop)
+
+    def reverse_offline(self, coords):
+        geocoder = get_offline_geocoder() if self.use_offline else None
+        if geocoder is None:
+            return [None] * len(coords)
+        addresses = [geocoder.reverse(lat, lon) for lat, lon in coords]
+        self.offline_hits += sum(address is not None for address in addresses)
+        return addresses
+
+    async def _reverse_all(self, coords):
+        # 가제티어 적재(첫 호출 시 CSV 전체 읽기)와 조회는 호출한 스레드가 아닌 실행기에서 수행
+        addresses = await self.loop.run_in_executor(None, self.reverse_offline, coords)
+        missing = [i for i, address in enumerate(addresses) if address is None]
+        if missing:
+            # 오프라인으로 찾지 못한 좌표만 HTTP로 조회
+            found = await self._reverse_many([coords[i] for i in missing])
+            for i, address in zip(missing, found):
+                addresses[i] = address
+        return addresses
+
+    def reverse_many(self, coords, timeout=LOOKUP_TIMEOUT):
+        return self.submit_many(coords).result(timeout)
+
+    def reverse(self, lat, lon, timeout=LOOKUP_TIMEOUT):
+        return self.reverse_many([(lat, lon)], timeout)[0]
+
+    async def _reverse_many(self, coords):
+        return await asyncio.gather(*(self._reverse(lat, lon) for lat, lon in coords))
+
+    async def _reverse(self, lat, lon):
+        key = coord_key(lat, lon)
+        address = self.cache.get(key)
+        if address is not None:
+            self.cache_hits += 1
+            return address
+        # 같은 지점을 이미 요청 중이면 그 결과를 함께 기다림
+        future = self.inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(key))
+            self.inflight[key] = future
+            future.add_done_callback(lambda _: self.inflight.pop(key, None))
+        return await future
+
+    async def _wait_for_turn(self):
+        async with self.rate_lock:
+            delay = self.next_request_time - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.next_request_time = time.monotonic() + self.min_interval
+
+    async def _fetch(self, key):
+        params = {
+            "lat": key[0],
+            "lon": key[1],
+            "format": "json",
+            "zoom": 18,
+            "accept-language": "ko"
+        }
+        await self._wait_for_turn()
+        self.requests_sent += 1
+        try:
+            async with self.session.get(self.base_url, params=params) as response:
+                if response.status != 200:
+                    return f"API 오류: {response.status}"
+                address = format_address(await response.json(content_type=None))
+        except Exception as e:
+            print(f"주소 조회 중 오류 발생: {e}")
+            return "주소 조회 실패"
+        # 실패 결과는 저장하지 않아 다음 요청에서 다시 시도
+        self.cache.put(key, address)
+        return address
+
+    def close(self):
+        with self.start_lock:
+            if self.loop is None:
+                return
+            asyncio.run_coroutine_threadsafe(self._teardown(), self.loop).result(self.timeout)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(self.timeout)
+            self.loop.close()
+            self.loop = None
+
+    async def _teardown(self):
+        await self.session.close()
+        self.cache.close()
+
+_service = None
+_service_lock = threading.Lock()
+
+def get_geocoding_service():
+    """앱 전체에서 공유하는 서비스 (처음 요청할 때 시작)"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = GeocodingService()
+        return _service
+
+def close_geocoding_service():
+    global _service
+    with _service_lock:
+        if _service is not None:
+            _service.close()
+            _service = None
+
+def make_stub_server(port=STUB_PORT, delay=0.0):
+    """
+    테스트용 Nominatim 대체 서버 (좌표를 도로명으로 돌려줌)
+    - server.hits: 받은 요청 수 (중복 합치기/캐시가 동작하면 서로 다른 좌표 수와 같음)
+    - delay: 응답 전 대기 시간 (초, 동시에 들어온 요청이 합쳐지는지 확인용)
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import urlparse, parse_qs
+    import json
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with server.hits_lock:
+                server.hits += 1
+            query = parse_qs(urlparse(self.path).query)
+            lat, lon = query.get('lat', ['0'])[0], query.get('lon', ['0'])[0]
+            if delay:
+                time.sleep(delay)
+            body = json.dumps({'address': {
+                'country': "대한민국", 'city': "진주시", 'suburb': "테스트동", 'road': f"{lat},{lon}",
+            }}, ensure_ascii=False).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # 요청마다 출력하지 않음
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+    server.hits = 0
+    server.hits_lock = threading.Lock()
+    return server
+
+def serve_stub(port=STUB_PORT, delay=0.0):
+    server = make_stub_server(port, delay)
+    print(f"역지오코딩 대체 서버 실행: http://127.0.0.1:{port}/reverse")
+    try:
+        server.serve_forever()
+    finally:
+        print(f"받은 요청 {server.hits}건")
+        server.server_close()
+
+def check_stub(port=STUB_PORT, interval=CHECK_INTERVAL, delay=0.05):
+    """대체 서버로 중복 합치기, 캐시, 요청 간격 제한을 확인하고 모두 맞으면 True"""
+    server = make_stub_server(port, delay)
+    threading.Thread(target=server.serve_forever, name='geocoder-stub', daemon=True).start()
+    points = [(35.1534, 128.1128), (35.1767, 128.1035), (35.2, 128.05)]
+    # 같은 좌표와 반올림하면 같아지는 좌표를 섞어 한 번에 요청
+    coords = points + [(lat + 0.00001, lon - 0.00001) for lat, lon in points] + points
+    service = GeocodingService(base_url=f"http://127.0.0.1:{port}/reverse", cache_path=':memory:',
+                               min_interval=interval, use_offline=False)
+    try:
+        started = time.monotonic()
+        first = service.reverse_many(coords)
+        elapsed = time.monotonic() - started
+        second = service.reverse_many(coords)
+    finally:
+        service.close()
+        server.shutdown()
+        server.server_close()
+
+    checks = [
+        ("중복 좌표 합치기", server.hits == service.requests_sent == len(points)),
+        ("캐시 재사용", service.cache_hits == len(coords) and second == first),
+        ("요청 간격 제한", elapsed >= (len(points) - 1) * interval),
+    ]
+    print(f"좌표 {len(coords)}개 x 2회 조회: 서버 요청 {server.hits}건, 캐시 적중 {service.cache_hits}건, "
+          f"첫 조회 {elapsed:.2f}초 (간격 {interval}초)")
+    for name, ok in checks:
+        print(f"  {'통과' if ok else '실패'}: {name}")
+    return all(ok for _, ok in checks)
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    parser = argparse.ArgumentParser(description="좌표 역지오코딩")
+    parser.add_argument('lat', type=float, nargs='?')
+    parser.add_argument('lon', type=float, nargs='?')
+    parser.add_argument('--url', default=NOMINATIM_URL, help="Nominatim 호환 reverse 엔드포인트")
+    parser.add_argument('--cache', default=GEOCODE_CACHE_PATH, help="SQLite 캐시 경로 (':memory:'면 저장 안 함)")
+    parser.add_argument('--serve', type=int, default=None, metavar='PORT', help="대체 서버 실행")
+    parser.add_argument('--check', action='store_true', help="대체 서버로 중복 합치기/캐시/요청 간격 확인")
+    parser.add_argument('--port', type=int, default=STUB_PORT, help="--check에서 사용할 대체 서버 포트")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve_stub(args.serve)
+    elif args.check:
+        sys.exit(0 if check_stub(args.port) else 1)
+    elif args.lat is None or args.lon is None:
+        parser.error("lat, lon 또는 --serve/--check가 필요합니다.")
+    else:
+        service = GeocodingService(base_url=args.url, cache_path=args.cache)
+        try:
+            print(service.reverse(args.lat, args.lon))
+        finally:
+            service.close()
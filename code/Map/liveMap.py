@@ -0,0 +1,158 @@
+# liveMap.py
+# 한 번만 로드해 두고 JS API로 레이어만 바꾸는 지도 페이지 (folium 없이 동작해 앱 시작 시 가볍게 import 가능)
+import json
+import os
+
+# window.fireMap.updateFeatures(name, geojson, fit) : id가 같은 피처는 교체, 없으면 추가
+# window.fireMap.removeFeatures(name, ids)           : 피처 삭제
+# window.fireMap.setLayer(name, geojson, fit)        : 레이어 전체 교체
+# window.fireMap.removeLayer(name)                   : 레이어 삭제
+# 피처 properties: kind('circle'|'marker'|'line'), color, radius(m), weight, opacity, fill_opacity, popup, tooltip, label
+LIVE_MAP_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8"/>
+<link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css"/>
+<script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
+<style>
+html, body, #map { height: 100%; margin: 0; }
+.route-label { background: transparent; border: none; box-shadow: none; font-weight: bold; font-size: 14px;
+               text-shadow: -2px 0 white, 0 2px white, 2px 0 white, 0 -2px white; }
+</style>
+</head>
+<body>
+<div id="map"></div>
+<script>
+var map = L.map('map').setView([__LAT__, __LON__], __ZOOM__);
+L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
+    maxZoom: 19, attribution: '&copy; OpenStreetMap contributors'
+}).addTo(map);
+var layers = {};
+
+function toLatLng(xy) { return [xy[1], xy[0]]; }
+
+function makeLayer(feature) {
+    var p = feature.properties || {};
+    var coords = feature.geometry.coordinates;
+    var style = {
+        color: p.color || 'red', weight: p.weight || 2, opacity: p.opacity || 0.8,
+        fillColor: p.color || 'red', fillOpacity: p.fill_opacity || 0.3
+    };
+    var layer;
+    if (p.kind === 'marker') {
+        layer = L.marker(toLatLng(coords));
+    } else if (feature.geometry.type === 'Point') {
+        style.radius = p.radius || 50;
+        layer = L.circle(toLatLng(coords), style);
+    } else {
+        layer = L.polyline(coords.map(toLatLng), style);
+    }
+    if (p.popup) { layer.bindPopup(p.popup, {maxWidth: 300}); }
+    if (p.tooltip) { layer.bindTooltip(p.tooltip); }
+    if (p.label) { layer.bindTooltip(p.label, {permanent: true, direction: 'center', className: 'route-label'}); }
+    return layer;
+}
+
+function getLayer(name) {
+    if (!layers[name]) { layers[name] = {group: L.featureGroup().addTo(map), features: {}}; }
+    return layers[name];
+}
+
+window.fireMap = {
+    updateFeatures: function (name, collection, fit) {
+        var entry = getLayer(name);
+        collection.features.forEach(function (feature) {
+            var old = entry.features[feature.id];
+            if (old) { entry.group.removeLayer(old); }
+            var layer = makeLayer(feature);
+            entry.features[feature.id] = layer;
+            entry.group.addLayer(layer);
+        });
+        if (fit && entry.group.getLayers().length) { map.fitBounds(entry.group.getBounds(), {padding: [20, 20]}); }
+        return Object.keys(entry.features).length;
+    },
+    removeFeatures: function (name, ids) {
+        var entry = layers[name];
+        if (!entry) { return 0; }
+        ids.forEach(function (id) {
+            if (entry.features[id]) { entry.group.removeLayer(entry.features[id]); delete entry.features[id]; }
+        });
+        return Object.keys(entry.features).length;
+    },
+    setLayer: function (name, collection, fit) {
+        this.removeLayer(name);
+        return this.updateFeatures(name, collection, fit);
+    },
+    removeLayer: function (name) {
+        var entry = layers[name];
+        if (entry) { map.removeLayer(entry.group); delete layers[name]; }
+    }
+};
+</script>
+</body>
+</html>
+"""
+
+def write_live_map(filename, center_lat: float, center_lon: float, zoom: int = 13):
+    """JS API가 있는 지도 페이지를 저장 (앱 실행 중 한 번만 로드)"""
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    html = (LIVE_MAP_TEMPLATE.replace('__LAT__', repr(float(center_lat)))
+            .replace('__LON__', repr(float(center_lon)))
+            .replace('__ZOOM__', str(int(zoom))))
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(html)
+    return filename
+
+def js_call(function: str, *args) -> str:
+    """fireMap API 호출 스크립트 생성 (인자는 JSON으로 직렬화)"""
+    return f"window.fireMap.{function}({', '.join(json.dumps(arg, ensure_ascii=False) for arg in args)});"
+
+def point_feature(feature_id, lat, lon, **properties):
+    return {'type': 'Feature', 'id': feature_id,
+            'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+            'properties': properties}
+
+def line_feature(feature_id, points, **properties):
+    """points: [(lat, lon), ...]"""
+    return {'type': 'Feature', 'id': feature_id,
+            'geometry': {'type': 'LineString', 'coordinates': [[lon, lat] for lat, lon in points]},
+            'properties': properties}
+
+def feature_collection(features):
+    return {'type': 'FeatureCollection', 'features': list(features)}
+
+def resource_allocation_features(base_station: dict, resources: list) -> dict:
+    """
+    add_resource_allocations와 같은 내용을 GeoJSON FeatureCollection으로 생성
+    피처 id는 자원 종류와 순위로 고정해 변경된 피처만 다시 그릴 수 있게 함
+    """
+    radius_by_index = {
+        0: 300,
+        1: 150,
+        2: 75
+    }
+    base_lat, base_lon = base_station['latitude'], base_station['longitude']
+    features = [point_feature(
+        'base_station', base_lat, base_lon, kind='circle', radius=200, color='blue',
+        popup=f"기준 소방서<br>위치: ({base_lat:.6f}, {base_lon:.6f})"
+    )]
+
+    for rank, resource in enumerate(resources):
+        # 자원 타입에 따른 색상 설정
+        color = 'red' if resource['resource_type'] == 'truck' else 'green'
+        key = f"{resource['resource_type']}-{resource['type']}-{rank}"
+        popup_content = (
+            f"<b>자원 정보</b><br>유형: {resource['resource_type']}<br>종류: {resource['type']}<br>"
+            f"수량: {resource['quantity']}<br>위치: ({resource['latitude']:.6f}, {resource['longitude']:.6f})<br>"
+            f"거리: {resource['distance']:.1f}km<br>화재 위험도 순위: {rank}"
+        )
+        features.append(point_feature(
+            f'resource-{key}', resource['latitude'], resource['longitude'], kind='circle',
+            radius=radius_by_index.get(rank, 50), color=color, popup=popup_content
+        ))
+        # 기준 소방서에서 자원 위치까지의 경로와 거리 표시
+        features.append(line_feature(
+            f'route-{key}', [(base_lat, base_lon), (resource['latitude'], resource['longitude'])],
+            kind='line', color='black', weight=2, opacity=0.8, label=f"→ {resource['distance']:.1f}km"
+        ))
+    return feature_collection(features)
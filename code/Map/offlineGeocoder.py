@@ -0,0 +1,208 @@
+"""
+오프라인 역지오코더 (경상남도 도로/행정구역 추출본)
+- 도로 선을 일정 간격의 점으로 나눈 가제티어 CSV(lat, lon, road, suburb, city)를 격자 색인에 적재
+- 가장 가까운 도로 점을 찾아 Nominatim 결과와 같은 '국가 시 동 도로' 형식으로 반환
+- 가제티어가 없거나 반경 안에 도로가 없으면 None (호출한 쪽에서 HTTP 조회로 대체)
+- 가제티어(datasets/gyeongnam_gazetteer.csv)는 저장소에 포함하지 않으므로 설치 시 한 번 생성 (README 참고)
+
+가제티어 생성 예 (Overpass 등으로 받은 GeoJSON):
+    python -m code.Map.offlineGeocoder build gyeongnam_roads.geojson --admin gyeongnam_admin.geojson
+"""
+import csv
+import json
+import math
+import os
+import threading
+
+import numpy as np
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'datasets', 'gyeongnam_gazetteer.csv')
+COUNTRY = "대한민국"
+GRID_CELL_DEG = 0.005  # 격자 한 칸 크기 (위도 약 550m)
+MAX_DISTANCE_M = 300  # 이 거리 안에 도로가 없으면 오프라인 결과 없음
+SAMPLE_STEP_M = 50  # 가제티어 생성 시 도로 선 위 점 간격
+EARTH_RADIUS_M = 6371000.0
+CITY_ADMIN_LEVEL = '6'  # 시/군
+BUILD_COMMAND = "python -m code.Map.offlineGeocoder build <도로 GeoJSON> --admin <행정구역 GeoJSON>"
+SUBURB_ADMIN_LEVEL = '8'  # 읍/면/동
+
+class OfflineGeocoder:
+    """격자 색인 기반 최근접 도로 점 검색"""
+    def __init__(self, lats, lons, addresses, cell_size=GRID_CELL_DEG):
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lons = np.asarray(lons, dtype=np.float64)
+        self.addresses = list(addresses)
+        self.cell_size = cell_size
+
+        rows = np.floor(self.lats / cell_size).astype(np.int64)
+        cols = np.floor(self.lons / cell_size).astype(np.int64)
+        cells = {}
+        for i, key in enumerate(zip(rows.tolist(), cols.tolist())):
+            cells.setdefault(key, []).append(i)
+        self.cells = {key: np.array(indices, dtype=np.int64) for key, indices in cells.items()}
+
+    def __len__(self):
+        return len(self.addresses)
+
+    @classmethod
+    def load(cls, path=GAZETTEER_PATH):
+        lats, lons, addresses = [], [], []
+        with open(path, encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                lats.append(float(row['lat']))
+                lons.append(float(row['lon']))
+                addresses.append(" ".join([COUNTRY, row.get('city', ''), row.get('suburb', ''), row['road']]))
+        print(f"오프라인 가제티어 로드: {len(addresses)}개 지점 ({path})")
+        return cls(lats, lons, addresses)
+
+    def nearest(self, lat, lon, max_distance=MAX_DISTANCE_M):
+        """(가장 가까운 점 번호, 거리 m), 반경 안에 없으면 (None, None)"""
+        row = math.floor(lat / self.cell_size)
+        col = math.floor(lon / self.cell_size)
+        # 경도 방향 칸 크기가 가장 작으므로 그 기준으로 탐색할 칸 수 결정
+        cell_m = self.cell_size * math.pi / 180 * EARTH_RADIUS_M * math.cos(math.radians(lat))
+        rings = max(1, math.ceil(max_distance / cell_m))
+        candidates = [self.cells[key]
+                      for key in ((row + dr, col + dc) for dr in range(-rings, rings + 1) for dc in range(-rings, rings + 1))
+                      if key in self.cells]
+        if not candidates:
+            return None, None
+        indices = np.concatenate(candidates)
+
+        # 짧은 거리이므로 등장방형 근사로 충분
+        dlat = np.radians(self.lats[indices] - lat)
+        dlon = np.radians(self.lons[indices] - lon) * math.cos(math.radians(lat))
+        distances = np.hypot(dlat, dlon) * EARTH_RADIUS_M
+        best = int(np.argmin(distances))
+        if distances[best] > max_distance:
+            return None, None
+        return int(indices[best]), float(distances[best])
+
+    def reverse(self, lat, lon, max_distance=MAX_DISTANCE_M):
+        index, _ = self.nearest(lat, lon, max_distance)
+        return self.addresses[index] if index is not None else None
+
+_geocoder = None
+_geocoder_loaded = False
+_geocoder_lock = threading.Lock()
+_missing_reported = False
+
+def check_gazetteer(path=GAZETTEER_PATH):
+    """가제티어 파일이 있는지 확인 (없으면 생성 방법을 한 번만 출력, 앱 시작 시 호출)"""
+    global _missing_reported
+    if os.path.exists(path):
+        return True
+    if not _missing_reported:
+        _missing_reported = True
+        print(f"오프라인 가제티어가 없어 온라인 주소 조회만 사용합니다: {os.path.abspath(path)}")
+        print(f"  생성 방법: {BUILD_COMMAND}")
+    return False
+
+def get_offline_geocoder(path=GAZETTEER_PATH):
+    """가제티어를 한 번만 적재해 공유 (파일이 없으면 None)"""
+    global _geocoder, _geocoder_loaded
+    with _geocoder_lock:
+        if not _geocoder_loaded:
+            _geocoder_loaded = True
+            if check_gazetteer(path):
+                try:
+                    _geocoder = OfflineGeocoder.load(path)
+                except Exception as e:
+                    print(f"오프라인 가제티어 로드 실패: {e}")
+        return _geocoder
+
+def offline_reverse(lat, lon):
+    geocoder = get_offline_geocoder()
+    return geocoder.reverse(lat, lon) if geocoder is not None else None
+
+# --- 가제티어 생성 ---
+def _lines(geometry):
+    if geometry['type'] == 'LineString':
+        return [geometry['coordinates']]
+    if geometry['type'] == 'MultiLineString':
+        return geometry['coordinates']
+    return []
+
+def _polygons(geometry):
+    if geometry['type'] == 'Polygon':
+        return [geometry['coordinates'][0]]
+    if geometry['type'] == 'MultiPolygon':
+        return [polygon[0] for polygon in geometry['coordinates']]
+    return []
+
+def sample_line(coords, step=SAMPLE_STEP_M):
+    """[[lon, lat], ...] 선 위에 step(m) 간격으로 점 생성 (꼭짓점 포함)"""
+    points = [tuple(coords[0][:2])]
+    for start, end in zip(coords, coords[1:]):
+        (lon1, lat1), (lon2, lat2) = start[:2], end[:2]
+        dx = math.radians(lon2 - lon1) * math.cos(math.radians((lat1 + lat2) / 2)) * EARTH_RADIUS_M
+        dy = math.radians(lat2 - lat1) * EARTH_RADIUS_M
+        count = max(1, int(math.hypot(dx, dy) // step))
+        for k in range(1, count + 1):
+            t = k / count
+            points.append((lon1 + (lon2 - lon1) * t, lat1 + (lat2 - lat1) * t))
+    return points
+
+def build_gazetteer(roads_geojson, admin_geojson=None, output=GAZETTEER_PATH, step=SAMPLE_STEP_M):
+    """
+    이름 있는 도로(LineString) GeoJSON을 점 가제티어 CSV로 변환
+    admin_geojson이 있으면 admin_level 6/8 경계로 시/군, 읍/면/동 이름을 붙임
+    """
+    with open(roads_geojson, encoding='utf-8') as f:
+        roads = json.load(f)['features']
+
+    points, names = [], []
+    for feature in roads:
+        name = (feature.get('properties') or {}).get('name')
+        if not name:
+            continue
+        for line in _lines(feature['geometry']):
+            sampled = sample_line(line, step)
+            points.extend(sampled)
+            names.extend([name] * len(sampled))
+    points = np.array(points, dtype=np.float64).reshape(-1, 2)
+    cities = [''] * len(points)
+    suburbs = [''] * len(points)
+
+    if admin_geojson:
+        from matplotlib.path import Path
+        with open(admin_geojson, encoding='utf-8') as f:
+            admins = json.load(f)['features']
+        for feature in admins:
+            properties = feature.get('properties') or {}
+            level = str(properties.get('admin_level', ''))
+            target = cities if level == CITY_ADMIN_LEVEL else suburbs if level == SUBURB_ADMIN_LEVEL else None
+            if target is None or not properties.get('name'):
+                continue
+            for ring in _polygons(feature['geometry']):
+                inside = Path(np.asarray(ring, dtype=np.float64)[:, :2]).contains_points(points)
+                for i in np.flatnonzero(inside):
+                    target[i] = properties['name']
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['lat', 'lon', 'road', 'suburb', 'city'])
+        for (lon, lat), road, suburb, city in zip(points.tolist(), names, suburbs, cities):
+            writer.writerow([f'{lat:.6f}', f'{lon:.6f}', road, suburb, city])
+    print(f"가제티어를 저장했습니다: {output} ({len(names)}개 지점)")
+    return output
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="오프라인 역지오코더")
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help="도로/행정구역 GeoJSON으로 가제티어 생성")
+    build.add_argument('roads', help="이름 있는 도로 LineString GeoJSON")
+    build.add_argument('--admin', default=None, help="행정구역 경계 GeoJSON (admin_level 6/8)")
+    build.add_argument('--output', default=GAZETTEER_PATH)
+    build.add_argument('--step', type=float, default=SAMPLE_STEP_M, help="도로 위 점 간격 (m)")
+    lookup = sub.add_parser('reverse', help="좌표의 주소 조회")
+    lookup.add_argument('lat', type=float)
+    lookup.add_argument('lon', type=float)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        build_gazetteer(args.roads, args.admin, args.output, args.step)
+    else:
+        print(offline_reverse(args.lat, args.lon) or "주소 없음 (가제티어 범위 밖)")
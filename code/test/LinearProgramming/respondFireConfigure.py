@@ -3,6 +3,9 @@ import numpy as np
 import joblib
 import random
 import math
+import os
+import hashlib
+import threading
 from typing import Dict, List, Tuple
 import pulp
 
@@ -16,6 +19,10 @@ KOREAN_GBRT_MODEL_PATH = 'code/test/LinearProgramming/model/korean_gbrt_demand_m
 US_LINEAR_MODEL_PATH = 'code/test/LinearProgramming/model/us_acres_personnel_linear_model.joblib'
 GBRT_FEATURE_NAMES_PATH = 'code/test/LinearProgramming/model/gbrt_trained_feature_names.txt' # 학습된 특성명 리스트 파일 code\test\LinearProgramming\model\gbrt_trained_feature_names.txt
 
+# 전처리된 시나리오 데이터 캐시 (전처리 로직을 바꾸면 버전을 올려 기존 캐시 무효화)
+SCENARIO_DATA_VERSION = 1
+SCENARIO_CACHE_DIR = 'code/test/LinearProgramming/cache'
+
 # --- 0. (ml.py에서 복사 또는 임포트) add_us_based_personnel_prediction 함수 ---
 # respondFireConfigure.py가 ml.py와 다른 환경에서 실행될 경우,
 # 이 함수를 여기에 직접 정의하거나, ml.py를 import 할 수 있도록 경로 설정 필요.
@@ -42,7 +49,94 @@ def add_us_based_personnel_prediction_local(df_kr_processed, us_model, acres_col
     return df_with_prediction
 
 # --- 1. 데이터 로드 및 시나리오 생성을 위한 기본 전처리 ---
-def load_and_preprocess_data_for_scenario(korea_data_file_path):
+_scenario_data_cache = {}  # 캐시 키 -> 전처리된 DataFrame (프로세스 전체 공유)
+_scenario_data_lock = threading.Lock()
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def scenario_cache_key(korea_data_file_path):
+    """(CSV 경로, CSV 수정 시각/크기, US 모델 수정 시각/크기, 전처리 코드 버전)"""
+    us_model_signature = _file_signature(US_LINEAR_MODEL_PATH) if os.path.exists(US_LINEAR_MODEL_PATH) else None
+    return (os.path.abspath(korea_data_file_path), _file_signature(korea_data_file_path),
+            us_model_signature, SCENARIO_DATA_VERSION)
+
+def _scenario_cache_name(key):
+    return os.path.splitext(os.path.basename(key[0]))[0]
+
+def scenario_cache_path(key):
+    digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(SCENARIO_CACHE_DIR, f'{_scenario_cache_name(key)}-{digest}.parquet')
+
+def load_and_preprocess_data_for_scenario(korea_data_file_path, use_cache=True):
+    """
+    전처리된 시나리오 데이터 반환
+    - 같은 프로세스에서는 메모리 캐시 사용, 재시작 후에는 Parquet 캐시로 CSV 파싱/매핑/US 모델 적용 생략
+    - CSV나 US 모델 파일이 바뀌거나 SCENARIO_DATA_VERSION이 바뀌면 다시 전처리
+    - 호출한 쪽에서 수정해도 캐시가 오염되지 않도록 복사본 반환
+    """
+    if not use_cache:
+        return _preprocess_data_for_scenario(korea_data_file_path)
+    try:
+        key = scenario_cache_key(korea_data_file_path)
+    except FileNotFoundError:
+        print(f"오류: 시나리오 생성용 한국 데이터 파일을 찾을 수 없습니다 - {korea_data_file_path}")
+        return None
+
+    with _scenario_data_lock:
+        df_cached = _scenario_data_cache.get(key)
+        if df_cached is None:
+            df_cached = _read_scenario_cache(key)
+            if df_cached is None:
+                df_cached = _preprocess_data_for_scenario(korea_data_file_path)
+                if df_cached is None:
+                    return None
+                _write_scenario_cache(key, df_cached)
+            _scenario_data_cache.clear()  # 파일이 바뀐 이전 버전은 메모리에서 제거
+            _scenario_data_cache[key] = df_cached
+    return df_cached.copy()
+
+def _read_scenario_cache(key):
+    path = scenario_cache_path(key)
+    if not os.path.exists(path):
+        return None
+    try:
+        df_cached = pd.read_parquet(path)
+        print(f"시나리오 생성용 데이터 캐시 사용: {path}")
+        return df_cached
+    except Exception as e:
+        print(f"시나리오 데이터 캐시 읽기 실패, 다시 전처리합니다: {e}")
+        return None
+
+def _write_scenario_cache(key, df_processed):
+    path = scenario_cache_path(key)
+    try:
+        os.makedirs(SCENARIO_CACHE_DIR, exist_ok=True)
+        tmp_path = path + '.tmp'
+        df_processed.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        _remove_stale_scenario_caches(key, path)
+    except Exception as e:
+        # pyarrow가 없거나 컬럼 타입이 섞여 있으면 메모리 캐시만 사용
+        print(f"시나리오 데이터 캐시 저장 실패 (메모리 캐시만 사용): {e}")
+        if os.path.exists(path + '.tmp'):
+            os.remove(path + '.tmp')
+
+def _remove_stale_scenario_caches(key, current_path):
+    """같은 CSV 이름의 이전 캐시(CSV/US 모델/버전이 바뀌기 전 키) 삭제"""
+    prefix = _scenario_cache_name(key) + '-'
+    for name in os.listdir(SCENARIO_CACHE_DIR):
+        path = os.path.join(SCENARIO_CACHE_DIR, name)
+        # 이름 뒤에 해시 16자리가 붙은 파일만 대상 (다른 CSV의 'WSQ000301-extra-...' 같은 이름은 제외)
+        if (name.startswith(prefix) and name.endswith('.parquet') and len(name) == len(prefix) + 16 + len('.parquet')
+                and path != current_path):
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"이전 시나리오 데이터 캐시 삭제 실패: {e}")
+
+def _preprocess_data_for_scenario(korea_data_file_path):
     try:
         df_kr_raw = pd.read_csv(korea_data_file_path, encoding='UTF-8')
         print(f"시나리오 생성용 한국 데이터 로드 성공: {df_kr_raw.shape}")
@@ -0,0 +1,164 @@
+"""
+GUI 없이 여러 영상 파일을 프로세스 풀에서 병렬로 분석하는 명령행 도구
+감지 결과(파일, 프레임 번호, 영상 시각, 박스, 신뢰도)를 JSONL 또는 Parquet으로 저장
+
+사용 예:
+    python -m code.videoProcess.batchAnalyze archive/2025-06-01 --output detections.jsonl
+    python -m code.videoProcess.batchAnalyze a.mp4 b.mp4 --workers 4 --output detections.parquet
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mkv', '.mov')
+WORKERS = max(1, (os.cpu_count() or 2) // 2)
+THREADS_PER_WORKER = 2  # 프로세스마다 OpenCV/추론에 쓸 스레드 수 (코어 과다 점유 방지)
+
+def collect_videos(inputs):
+    """디렉터리와 파일 목록을 받아 분석할 영상 파일 목록으로 펼침"""
+    videos = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for ext in VIDEO_EXTENSIONS:
+                videos.extend(glob.glob(os.path.join(item, '**', f'*{ext}'), recursive=True))
+        elif os.path.isfile(item):
+            videos.append(item)
+        else:
+            print(f"경고: 파일을 찾을 수 없습니다: {item}")
+    return sorted(set(videos))
+
+def init_worker(threads=THREADS_PER_WORKER):
+    # 프로세스마다 스레드 수를 제한해 워커끼리 코어를 빼앗지 않도록 함
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    import cv2
+    cv2.setNumThreads(threads)
+
+def analyze_file(path, use_gate=True, conf_threshold=None, stride=1, start=None, end=None, threads=THREADS_PER_WORKER,
+                 backend=None):
+    """영상 파일 하나를 분석해 감지 목록 반환 (워커 프로세스에서 실행)"""
+    import code.videoProcess.videoProcess as vP
+    from code.videoProcess.frameSource import FrameSource
+    from code.videoProcess.gating import InferenceGate
+    from code.videoProcess.tracker import FIRE_CONF_THRESHOLD, extract_detections
+
+    if conf_threshold is None:
+        conf_threshold = FIRE_CONF_THRESHOLD
+    # 워커 프로세스끼리 코어를 나눠 쓰도록 추론 스레드 수도 threads로 제한
+    model = vP.get_fire_model(backend=backend, threads=threads)
+    preprocessor = vP.FramePreprocessor(max_workers=threads)
+    gate = InferenceGate()
+
+    detections = []
+    frames = 0
+    started = time.perf_counter()
+    # stride 간격으로 건너뛸 프레임은 디코딩하지 않음
+    source = FrameSource(path)
+    try:
+        for frame_index, timestamp, frame in source.frames(stride, start, end):
+            frames += 1
+
+            if use_gate:
+                preprocessor.process(frame)
+                if not gate.should_infer(*preprocessor.gate_masks()):
+                    continue
+
+            found = extract_detections(model(frame, verbose=False), conf_threshold)
+            gate.report(bool(found))
+            for box, conf in found:
+                detections.append({
+                    'file': path,
+                    'frame_index': frame_index,
+                    'timestamp': round(timestamp, 3),
+                    'box': [round(v, 1) for v in box],
+                    'confidence': round(conf, 4),
+                })
+    finally:
+        source.release()
+        preprocessor.close()
+
+    return {
+        'file': path,
+        'frames': frames,
+        'inferred': gate.inferred if use_gate else frames,
+        'seconds': round(time.perf_counter() - started, 2),
+        'detections': detections,
+    }
+
+def write_jsonl(records, f):
+    for record in records:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    f.flush()
+
+def run_batch(videos, output, workers=WORKERS, use_gate=True, conf_threshold=None, stride=1, start=None, end=None,
+              threads=THREADS_PER_WORKER, backend=None):
+    """프로세스 풀에서 영상들을 분석하고 결과를 output에 저장"""
+    parquet = output.endswith('.parquet')
+    all_records = []
+    jsonl_file = None if parquet else open(output, 'w', encoding='utf-8')
+    total_start = time.perf_counter()
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(threads,)) as executor:
+            futures = {
+                executor.submit(analyze_file, path, use_gate, conf_threshold, stride, start, end, threads, backend): path
+                for path in videos
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                path = futures[future]
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    print(f"[{done}/{len(videos)}] 분석 실패: {path} ({e})")
+                    continue
+
+                print(f"[{done}/{len(videos)}] {path}: 프레임 {summary['frames']}개, "
+                      f"추론 {summary['inferred']}회, 감지 {len(summary['detections'])}건, {summary['seconds']}초")
+                if parquet:
+                    all_records.extend(summary['detections'])
+                else:
+                    # 파일 단위로 바로 기록 (중간에 중단돼도 끝난 파일의 결과는 남음)
+                    write_jsonl(summary['detections'], jsonl_file)
+    finally:
+        if jsonl_file is not None:
+            jsonl_file.close()
+
+    if parquet:
+        import pandas as pd
+        columns = ['file', 'frame_index', 'timestamp', 'box', 'confidence']
+        pd.DataFrame(all_records, columns=columns).to_parquet(output, index=False)
+
+    print(f"전체 {len(videos)}개 영상 분석 완료 ({time.perf_counter() - total_start:.1f}초): {output}")
+
+def main(argv=None):
+    from code.videoProcess.videoProcess import DETECTOR_BACKENDS
+    parser = argparse.ArgumentParser(description="영상 파일 일괄 화재 감지 (GUI 없음)")
+    parser.add_argument('inputs', nargs='+', help="영상 파일 또는 디렉터리")
+    parser.add_argument('--output', default='detections.jsonl', help="결과 파일 (.jsonl 또는 .parquet)")
+    parser.add_argument('--workers', type=int, default=WORKERS, help="프로세스 수")
+    parser.add_argument('--threads', type=int, default=THREADS_PER_WORKER, help="프로세스마다 전처리/OpenCV에 쓸 스레드 수")
+    parser.add_argument('--conf', type=float, default=None, help="최소 신뢰도")
+    parser.add_argument('--stride', type=int, default=1, help="N 프레임마다 한 번 분석 (나머지는 디코딩하지 않음)")
+    parser.add_argument('--start', type=float, default=None, help="분석 시작 시각(초)")
+    parser.add_argument('--end', type=float, default=None, help="분석 종료 시각(초)")
+    parser.add_argument('--no-gate', action='store_true', help="색상/움직임 게이트 없이 모든 프레임 추론")
+    parser.add_argument('--backend', choices=DETECTOR_BACKENDS, default=None,
+                        help="감지기 백엔드 (기본: FIRE_DETECTOR_BACKEND 환경 변수 또는 torch)")
+    args = parser.parse_args(argv)
+
+    videos = collect_videos(args.inputs)
+    if not videos:
+        print("분석할 영상이 없습니다.")
+        return 1
+    run_batch(videos, args.output, workers=args.workers, use_gate=not args.no_gate, conf_threshold=args.conf,
+              stride=max(1, args.stride), start=args.start, end=args.end, threads=max(1, args.threads),
+              backend=args.backend)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+영상 처리 파이프라인 성능 기준 측정
+합성 영상(움직이는 불꽃 모양 + 잡음 배경)을 만들어 단계별 p50/p95/p99를 JSON으로 저장
+
+사용 예:
+    python -m code.videoProcess.benchmark --frames 300 --output profiles/benchmark.json
+    python -m code.videoProcess.benchmark --detector   # YOLO 추론까지 포함
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+import cv2
+import numpy as np
+
+from code.videoProcess.profiler import StageProfiler
+from code.videoProcess.gating import InferenceGate
+import code.videoProcess.videoProcess as vP
+
+BENCHMARK_CLIP = 'profiles/synthetic_fire.mp4'
+BENCHMARK_OUTPUT = 'profiles/benchmark.json'
+
+def make_synthetic_clip(path=BENCHMARK_CLIP, frames=300, size=(1280, 720), fps=30, seed=42):
+    """재현 가능한 합성 영상 생성 (같은 seed면 항상 같은 영상)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    rng = np.random.default_rng(seed)
+    width, height = size
+
+    # 숲 느낌의 정적 배경 (녹색/갈색 잡음)
+    background = np.zeros((height, width, 3), dtype=np.uint8)
+    background[:, :, 1] = rng.integers(60, 120, (height, width), dtype=np.uint8)
+    background[:, :, 2] = rng.integers(30, 70, (height, width), dtype=np.uint8)
+    background = cv2.GaussianBlur(background, (7, 7), 0)
+
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    for i in range(frames):
+        frame = background.copy()
+        # 화면 절반 이후부터 흔들리는 주황색 불꽃이 천천히 이동
+        if i >= frames // 2:
+            cx = int(width * 0.3 + (i - frames // 2) * 2)
+            cy = int(height * 0.6)
+            radius = int(40 + 10 * np.sin(i / 3))
+            cv2.circle(frame, (cx, cy), radius, (0, 90, 255), -1)
+            cv2.circle(frame, (cx, cy - radius // 2), radius // 2, (40, 200, 255), -1)
+        noise = rng.integers(0, 8, frame.shape, dtype=np.uint8)
+        writer.write(cv2.add(frame, noise))
+    writer.release()
+    print(f"합성 영상을 저장했습니다: {path}")
+    return path
+
+def run_benchmark(path=BENCHMARK_CLIP, output=BENCHMARK_OUTPUT, use_detector=False):
+    """영상 전체를 처리하며 단계별 지연을 측정하고 JSON으로 저장"""
+    profiler = StageProfiler(os.path.basename(path))
+    preprocessor = vP.FramePreprocessor(profiler=profiler)
+    gate = InferenceGate()
+    model = vP.get_fire_model() if use_detector else None
+
+    cap = cv2.VideoCapture(path)
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        with profiler.stage('frame'):
+            preprocessor.process(frame)
+            if gate.should_infer(*preprocessor.gate_masks()) and model is not None:
+                with profiler.stage('yolo'):
+                    detection_result = model(frame, verbose=False)
+                with profiler.stage('visualize'):
+                    vP.visualize_fire_detection(frame, detection_result)
+    cap.release()
+    preprocessor.close()
+
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    profiler.dump_json(output)
+    print(profiler.status_text())
+    print(f"YOLO 추론 생략 비율: {gate.skip_ratio() * 100:.1f}%")
+    return profiler.summary()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="영상 처리 파이프라인 성능 측정")
+    parser.add_argument('--clip', default=BENCHMARK_CLIP, help="측정할 영상 (없으면 합성 영상 생성)")
+    parser.add_argument('--frames', type=int, default=300, help="합성 영상 프레임 수")
+    parser.add_argument('--output', default=BENCHMARK_OUTPUT, help="결과 JSON 경로")
+    parser.add_argument('--detector', action='store_true', help="YOLO 추론까지 포함")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.clip):
+        make_synthetic_clip(args.clip, frames=args.frames)
+    run_benchmark(args.clip, args.output, use_detector=args.detector)
@@ -0,0 +1,74 @@
+import cv2
+
+class FrameSource:
+    """
+    cv2.VideoCapture 래퍼
+    - 건너뛸 프레임은 grab()으로 디코딩 없이 넘기고, 분석할 프레임만 retrieve()로 디코딩
+    - 영상 시각(초)으로 이동 가능 (보관 영상 검색용)
+    """
+    def __init__(self, source):
+        self.source = source
+        self.cap = cv2.VideoCapture(source)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 0.0
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.index = -1  # 마지막으로 가져온(grab) 프레임 번호
+        self.decoded = 0
+        self.grabbed = 0
+
+    def is_opened(self):
+        return self.cap.isOpened()
+
+    @property
+    def timestamp(self):
+        """마지막으로 가져온 프레임의 영상 시각(초)"""
+        msec = self.cap.get(cv2.CAP_PROP_POS_MSEC)
+        if msec <= 0 and self.fps > 0 and self.index > 0:
+            return self.index / self.fps
+        return msec / 1000.0
+
+    def skip(self, count):
+        """count개 프레임을 디코딩 없이 넘기고, 실제로 넘긴 수를 반환"""
+        skipped = 0
+        for _ in range(count):
+            if not self.cap.grab():
+                break
+            self.index += 1
+            self.grabbed += 1
+            skipped += 1
+        return skipped
+
+    def read(self, stride=1):
+        """stride-1개를 건너뛰고 다음 프레임 하나만 디코딩해 (성공 여부, 프레임) 반환"""
+        if stride > 1 and self.skip(stride - 1) < stride - 1:
+            return False, None
+        if not self.cap.grab():
+            return False, None
+        self.index += 1
+        self.grabbed += 1
+        ret, frame = self.cap.retrieve()
+        if ret:
+            self.decoded += 1
+        return ret, frame
+
+    def seek(self, seconds):
+        """영상 시각(초)으로 이동 (다음 read()가 그 시각의 프레임을 반환)"""
+        self.cap.set(cv2.CAP_PROP_POS_MSEC, max(0.0, seconds) * 1000.0)
+        self.index = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES)) - 1
+
+    def frames(self, stride=1, start=None, end=None):
+        """(프레임 번호, 영상 시각, 프레임)을 stride 간격으로 반환하는 생성기"""
+        if start:
+            self.seek(start)
+        while True:
+            ret, frame = self.read(stride)
+            if not ret:
+                break
+            timestamp = self.timestamp
+            if end is not None and timestamp > end:
+                break
+            yield self.index, timestamp, frame
+
+    def release(self):
+        self.cap.release()
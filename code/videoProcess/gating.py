@@ -0,0 +1,75 @@
+import cv2
+import numpy as np
+
+COLOR_RATIO_THRESHOLD = 0.0005  # 화재 색상 후보 픽셀 비율 임계값
+MOTION_RATIO_THRESHOLD = 0.002  # MOG2 전경(움직임) 픽셀 비율 임계값
+KEYFRAME_INTERVAL = 30  # 조용한 프레임이 이어져도 이 간격마다 한 번은 추론
+HOLD_FRAMES = 15  # 화재가 감지된 뒤 이 프레임 수 동안은 게이트를 열어둠
+MOG2_FOREGROUND = 200  # MOG2 출력에서 전경(255)과 그림자(127)를 구분하는 값
+
+class InferenceGate:
+    """
+    색상/움직임 마스크로 YOLO 추론 여부를 결정하는 게이트
+    - HSV와 YCrCb 마스크가 모두 화재 색으로 본 픽셀, 또는 MOG2 전경 픽셀이 임계값을 넘을 때만 추론
+    - 정적인 장면에서도 KEYFRAME_INTERVAL마다 강제로 추론
+    - 화재가 감지되면 HOLD_FRAMES 동안은 매 프레임 추론 (확정 판단이 끊기지 않도록)
+    """
+    def __init__(self, color_threshold=COLOR_RATIO_THRESHOLD, motion_threshold=MOTION_RATIO_THRESHOLD,
+                 keyframe_interval=KEYFRAME_INTERVAL, hold_frames=HOLD_FRAMES):
+        self.color_threshold = color_threshold
+        self.motion_threshold = motion_threshold
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.hold_frames = hold_frames
+        self.buffers = {}
+        self.reset()
+
+    def reset(self):
+        self.frames_since_inference = None  # None이면 첫 프레임 (항상 추론)
+        self.hold_remaining = 0
+        self.inferred = 0
+        self.skipped = 0
+        self.color_ratio = 0.0
+        self.motion_ratio = 0.0
+
+    def _work_buffer(self, name, shape):
+        # 색상 마스크와 MOG2 마스크는 해상도가 다를 수 있으므로 버퍼를 따로 둠
+        buffer = self.buffers.get(name)
+        if buffer is None or buffer.shape != shape:
+            buffer = self.buffers[name] = np.zeros(shape, dtype=np.uint8)
+        return buffer
+
+    def should_infer(self, hsv_mask, ycrcb_mask, bg_mask):
+        """이번 프레임에 YOLO를 실행해야 하면 True"""
+        buffer = self._work_buffer('color', hsv_mask.shape)
+        cv2.bitwise_and(hsv_mask, ycrcb_mask, dst=buffer)
+        self.color_ratio = cv2.countNonZero(buffer) / float(hsv_mask.size)
+
+        buffer = self._work_buffer('motion', bg_mask.shape)
+        cv2.threshold(bg_mask, MOG2_FOREGROUND, 255, cv2.THRESH_BINARY, dst=buffer)
+        self.motion_ratio = cv2.countNonZero(buffer) / float(bg_mask.size)
+
+        infer = (
+            self.frames_since_inference is None
+            or self.frames_since_inference + 1 >= self.keyframe_interval
+            or self.hold_remaining > 0
+            or self.color_ratio >= self.color_threshold
+            or self.motion_ratio >= self.motion_threshold
+        )
+
+        if infer:
+            self.frames_since_inference = 0
+            self.hold_remaining = max(0, self.hold_remaining - 1)
+            self.inferred += 1
+        else:
+            self.frames_since_inference += 1
+            self.skipped += 1
+        return infer
+
+    def report(self, fire_detected):
+        """추론 결과를 알려주면 화재 감지 후 일정 기간 게이트를 열어둠"""
+        if fire_detected:
+            self.hold_remaining = self.hold_frames
+
+    def skip_ratio(self):
+        total = self.inferred + self.skipped
+        return self.skipped / total if total else 0.0
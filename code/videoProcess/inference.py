@@ -0,0 +1,144 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+MAX_BATCH_SIZE = 8  # 한 번의 fire_model 호출에 넣을 최대 프레임 수
+MAX_WAIT = 0.03  # 배치가 다 차지 않아도 첫 요청 후 이 시간(초)이 지나면 실행
+
+class InferenceResult:
+    """추론 결과를 요청한 스트림과 프레임 타임스탬프에 묶어 돌려주는 객체"""
+    def __init__(self, stream_id, timestamp, result, batch_size, latency):
+        self.stream_id = stream_id
+        self.timestamp = timestamp
+        self.result = result  # fire_model(frame) 결과 하나 (result.boxes 사용)
+        self.batch_size = batch_size  # 함께 처리된 프레임 수
+        self.latency = latency  # 요청부터 결과까지 걸린 시간(초)
+
+    def __iter__(self):
+        # 기존 코드처럼 `for result in detection_result` 형태로 사용 가능
+        return iter([self.result])
+
+class _Request:
+    def __init__(self, stream_id, frame, timestamp):
+        self.stream_id = stream_id
+        self.frame = frame
+        self.timestamp = timestamp
+        self.submitted = time.perf_counter()
+        self.future = Future()
+
+class InferenceService:
+    """
+    여러 스트림의 프레임을 마이크로 배치로 묶어 fire_model을 한 번에 호출하는 추론 서비스
+    - 배치는 MAX_BATCH_SIZE개가 모이거나 첫 요청 후 MAX_WAIT초가 지나면 실행 (지연 상한 보장)
+    - submit()은 Future를 반환하며, 결과는 InferenceResult로 각 스트림에 전달
+    """
+    def __init__(self, model=None, max_batch_size=MAX_BATCH_SIZE, max_wait=MAX_WAIT, backend=None):
+        self.model = model
+        self.backend = backend  # model이 없을 때 불러올 감지기 백엔드 (None이면 DETECTOR_BACKEND)
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self.requests = queue.Queue()
+        self.running = False
+        self.thread = None
+
+        # 통계
+        self.batches = 0
+        self.frames = 0
+
+    def start(self):
+        if self.running:
+            return self
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name='inference-service', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        self.requests.put(None)  # 대기 중인 워커 깨우기
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def submit(self, stream_id, frame, timestamp=None, callback=None):
+        """프레임 하나를 추론 대기열에 넣고 Future 반환 (callback이 있으면 완료 시 InferenceResult로 호출)"""
+        if not self.running:
+            self.start()
+        request = _Request(stream_id, frame, timestamp)
+        if callback is not None:
+            def on_done(future):
+                if not future.cancelled() and future.exception() is None:
+                    callback(future.result())
+            request.future.add_done_callback(on_done)
+        self.requests.put(request)
+        return request.future
+
+    def infer(self, stream_id, frame, timestamp=None):
+        """submit() 후 결과를 기다리는 동기 버전"""
+        return self.submit(stream_id, frame, timestamp).result()
+
+    def average_batch_size(self):
+        return self.frames / self.batches if self.batches else 0.0
+
+    def _get_model(self):
+        if self.model is None:
+            from code.videoProcess.videoProcess import get_fire_model
+            self.model = get_fire_model(backend=self.backend)
+        return self.model
+
+    def _collect_batch(self):
+        batch = []
+        deadline = None  # 첫 유효 요청이 들어온 뒤부터 MAX_WAIT 적용
+        while len(batch) < self.max_batch_size:
+            if deadline is None:
+                request = self.requests.get()
+            else:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self.requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if request is None:
+                break
+            # 호출한 쪽에서 이미 취소한 요청은 버림 (결과를 설정하면 InvalidStateError로 스레드가 종료됨)
+            if not request.future.set_running_or_notify_cancel():
+                continue
+            if deadline is None:
+                deadline = request.submitted + self.max_wait
+            batch.append(request)
+        return batch
+
+    def _run(self):
+        while self.running:
+            batch = self._collect_batch()
+            if batch:
+                self._process(batch)
+
+        # 종료 시 남은 요청은 취소
+        while True:
+            try:
+                request = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None:
+                request.future.cancel()
+
+    def _process(self, batch):
+        try:
+            results = self._get_model()([request.frame for request in batch], verbose=False)
+        except Exception as e:
+            print(f"배치 추론 중 오류 발생: {e}")
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.frames += len(batch)
+        done = time.perf_counter()
+        for request, result in zip(batch, results):
+            request.future.set_result(InferenceResult(
+                request.stream_id, request.timestamp, result, len(batch), done - request.submitted
+            ))
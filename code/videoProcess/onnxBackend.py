@@ -0,0 +1,194 @@
+import os
+import glob
+
+import cv2
+import numpy as np
+
+from code.videoProcess.videoProcess import DETECTOR_CONF_THRESHOLD
+
+FIRE_MODEL_PATH = 'model_/best.pt'
+ONNX_MODEL_PATH = 'model_/best.onnx'
+ONNX_INT8_MODEL_PATH = 'model_/best.int8.onnx'
+INPUT_SIZE = 640  # 학습 시 imgsz와 동일
+CONF_THRESHOLD = DETECTOR_CONF_THRESHOLD  # torch 백엔드와 같은 기준 (videoProcess에서 공유)
+IOU_THRESHOLD = 0.45
+CALIBRATION_FRAMES = 100  # int8 보정에 사용할 최대 프레임 수
+INTRA_OP_THREADS = max(1, (os.cpu_count() or 2) // 2)  # 물리 코어 수 근사값 (OMP_NUM_THREADS가 없을 때)
+
+def default_intra_op_threads():
+    """세션을 만들 때의 OMP_NUM_THREADS (batchAnalyze의 init_worker가 프로세스마다 설정), 없으면 INTRA_OP_THREADS"""
+    try:
+        return max(1, int(os.environ['OMP_NUM_THREADS']))
+    except (KeyError, ValueError):
+        return INTRA_OP_THREADS
+
+class OnnxBox:
+    """ultralytics Boxes의 개별 box와 같은 형태 (xyxy[0], conf[0], cls[0])"""
+    def __init__(self, xyxy, conf, cls):
+        self.xyxy = np.array([xyxy], dtype=np.float32)
+        self.conf = np.array([conf], dtype=np.float32)
+        self.cls = np.array([cls], dtype=np.float32)
+
+class OnnxResult:
+    """visualize_fire_detection에서 `result.boxes`로 순회할 수 있는 결과 객체"""
+    def __init__(self, boxes):
+        self.boxes = boxes
+
+def export_onnx(pt_path=FIRE_MODEL_PATH, onnx_path=ONNX_MODEL_PATH, imgsz=INPUT_SIZE):
+    """best.pt를 ONNX로 한 번만 변환 (이미 최신 파일이 있으면 재사용)"""
+    if os.path.exists(onnx_path) and (
+        not os.path.exists(pt_path) or os.path.getmtime(onnx_path) >= os.path.getmtime(pt_path)
+    ):
+        return onnx_path
+
+    from ultralytics import YOLO
+    exported = YOLO(pt_path).export(format='onnx', imgsz=imgsz, dynamic=True, simplify=True)
+    if os.path.abspath(exported) != os.path.abspath(onnx_path):
+        os.replace(exported, onnx_path)
+    print(f"ONNX 모델로 변환했습니다: {onnx_path}")
+    return onnx_path
+
+def letterbox(frame, size=INPUT_SIZE):
+    """비율을 유지한 채 size x size로 맞추고 (입력 텐서, 배율, (좌, 상) 여백) 반환"""
+    h, w = frame.shape[:2]
+    scale = min(size / h, size / w)
+    new_w, new_h = int(round(w * scale)), int(round(h * scale))
+    resized = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    pad_x, pad_y = (size - new_w) // 2, (size - new_h) // 2
+    canvas = np.full((size, size, 3), 114, dtype=np.uint8)
+    canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = resized
+
+    # BGR HWC uint8 -> RGB CHW float32 [0, 1]
+    tensor = canvas[:, :, ::-1].transpose(2, 0, 1).astype(np.float32) / 255.0
+    return tensor, scale, (pad_x, pad_y)
+
+def load_calibration_frames(source, max_frames=CALIBRATION_FRAMES):
+    """이미지 폴더 또는 영상 파일에서 보정용 프레임을 고르게 추출"""
+    frames = []
+    if os.path.isdir(source):
+        paths = sorted(
+            glob.glob(os.path.join(source, '*.jpg')) + glob.glob(os.path.join(source, '*.png'))
+        )
+        step = max(1, len(paths) // max_frames)
+        for path in paths[::step][:max_frames]:
+            image = cv2.imread(path)
+            if image is not None:
+                frames.append(image)
+    else:
+        cap = cv2.VideoCapture(source)
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or max_frames
+        step = max(1, total // max_frames)
+        index = 0
+        while len(frames) < max_frames:
+            if not cap.grab():
+                break
+            if index % step == 0:
+                ret, frame = cap.retrieve()
+                if ret:
+                    frames.append(frame)
+            index += 1
+        cap.release()
+    return frames
+
+def quantize_int8(calibration_source, onnx_path=ONNX_MODEL_PATH, int8_path=ONNX_INT8_MODEL_PATH, imgsz=INPUT_SIZE):
+    """로컬 프레임으로 보정해 ONNX 모델을 int8로 정적 양자화"""
+    from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+
+    frames = load_calibration_frames(calibration_source)
+    if not frames:
+        raise ValueError(f"보정용 프레임을 찾을 수 없습니다: {calibration_source}")
+
+    class FrameCalibrationReader(CalibrationDataReader):
+        def __init__(self, input_name):
+            self.inputs = iter([{input_name: letterbox(frame, imgsz)[0][None]} for frame in frames])
+
+        def get_next(self):
+            return next(self.inputs, None)
+
+    import onnxruntime as ort
+    input_name = ort.InferenceSession(onnx_path, providers=['CPUExecutionProvider']).get_inputs()[0].name
+    quantize_static(
+        onnx_path, int8_path, FrameCalibrationReader(input_name),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True
+    )
+    print(f"int8 양자화 모델을 저장했습니다: {int8_path} (보정 프레임 {len(frames)}개)")
+    return int8_path
+
+class OnnxFireDetector:
+    """
+    ONNX Runtime(CPU)으로 실행하는 화재 감지기
+    fire_model(frame) / fire_model([frame, ...])과 같은 방식으로 호출하며 OnnxResult 목록을 반환
+    """
+    def __init__(self, onnx_path=ONNX_MODEL_PATH, imgsz=INPUT_SIZE, conf_threshold=CONF_THRESHOLD,
+                 iou_threshold=IOU_THRESHOLD, intra_op_threads=None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = intra_op_threads or default_intra_op_threads()
+        options.inter_op_num_threads = 1
+
+        self.session = ort.InferenceSession(onnx_path, sess_options=options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+        self.imgsz = imgsz
+        self.conf_threshold = conf_threshold
+        self.iou_threshold = iou_threshold
+
+    def __call__(self, frames, verbose=False, **kwargs):
+        if isinstance(frames, np.ndarray):
+            frames = [frames]
+
+        # dynamic=True로 변환했으므로 호출마다 입력 해상도(imgsz)를 바꿀 수 있음
+        imgsz = kwargs.get('imgsz', self.imgsz)
+        prepared = [letterbox(frame, imgsz) for frame in frames]
+        batch = np.stack([tensor for tensor, _, _ in prepared])
+        outputs = self.session.run(None, {self.input_name: batch})[0]
+
+        return [
+            OnnxResult(self.decode(output, scale, pad, frame.shape[:2]))
+            for output, (_, scale, pad), frame in zip(outputs, prepared, frames)
+        ]
+
+    def decode(self, output, scale, pad, shape):
+        """YOLOv8 출력 (4 + 클래스 수, 후보 수)을 원본 좌표의 OnnxBox 목록으로 변환"""
+        predictions = output.T
+        class_scores = predictions[:, 4:]
+        class_ids = class_scores.argmax(axis=1)
+        confidences = class_scores[np.arange(len(class_ids)), class_ids]
+
+        keep = confidences > self.conf_threshold
+        if not np.any(keep):
+            return []
+        predictions, class_ids, confidences = predictions[keep], class_ids[keep], confidences[keep]
+
+        # cx, cy, w, h (입력 좌표) -> x1, y1, x2, y2 (원본 좌표)
+        cx, cy, w, h = predictions[:, 0], predictions[:, 1], predictions[:, 2], predictions[:, 3]
+        x1 = (cx - w / 2 - pad[0]) / scale
+        y1 = (cy - h / 2 - pad[1]) / scale
+        x2 = (cx + w / 2 - pad[0]) / scale
+        y2 = (cy + h / 2 - pad[1]) / scale
+        height, width = shape
+        x1, x2 = np.clip(x1, 0, width - 1), np.clip(x2, 0, width - 1)
+        y1, y2 = np.clip(y1, 0, height - 1), np.clip(y2, 0, height - 1)
+
+        rects = np.stack([x1, y1, x2 - x1, y2 - y1], axis=1).tolist()
+        indices = cv2.dnn.NMSBoxes(rects, confidences.tolist(), self.conf_threshold, self.iou_threshold)
+        return [
+            OnnxBox((x1[i], y1[i], x2[i], y2[i]), confidences[i], class_ids[i])
+            for i in np.array(indices).flatten()
+        ]
+
+def load_onnx_detector(pt_path=FIRE_MODEL_PATH, int8=False, calibration_source=None, intra_op_threads=None):
+    """필요하면 변환/양자화까지 한 뒤 OnnxFireDetector 생성"""
+    onnx_path = export_onnx(pt_path)
+    if int8:
+        if not os.path.exists(ONNX_INT8_MODEL_PATH) or os.path.getmtime(ONNX_INT8_MODEL_PATH) < os.path.getmtime(onnx_path):
+            if calibration_source is None:
+                raise ValueError("int8 양자화에는 보정용 프레임 경로가 필요합니다.")
+            quantize_int8(calibration_source, onnx_path)
+        onnx_path = ONNX_INT8_MODEL_PATH
+    return OnnxFireDetector(onnx_path, intra_op_threads=intra_op_threads)
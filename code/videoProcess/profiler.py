@@ -0,0 +1,96 @@
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+PROFILE_WINDOW = 1000  # 단계별로 보관할 최근 측정값 수
+PERCENTILES = [50, 95, 99]
+
+def check_percentiles(percentiles):
+    if any(not 0 <= p <= 100 for p in percentiles):
+        raise ValueError(f"백분위수는 0~100 사이여야 합니다: {list(percentiles)}")
+
+class StageProfiler:
+    """
+    스트림 하나의 단계별 처리 시간을 최근 PROFILE_WINDOW개만 보관하며 p50/p95/p99를 계산하는 프로파일러
+    스레드 풀의 작업에서도 기록할 수 있도록 스레드 안전하게 동작
+    """
+    def __init__(self, name='stream', window=PROFILE_WINDOW):
+        self.name = name
+        self.window = window
+        self.samples = {}  # 단계 이름 -> deque[초]
+        self.lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        with self.lock:
+            if stage not in self.samples:
+                self.samples[stage] = deque(maxlen=self.window)
+            self.samples[stage].append(seconds)
+
+    @contextmanager
+    def stage(self, stage):
+        """`with profiler.stage('yolo'):` 형태로 구간 측정"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def wrap(self, stage, func):
+        """스레드 풀에 제출할 함수를 측정 함수로 감쌈"""
+        def timed(*args, **kwargs):
+            with self.stage(stage):
+                return func(*args, **kwargs)
+        return timed
+
+    def reset(self):
+        with self.lock:
+            self.samples = {}
+
+    def percentiles(self, stage, percentiles=PERCENTILES):
+        """단계 하나의 통계 (밀리초, percentiles는 0~100 사이 값)"""
+        check_percentiles(percentiles)
+        with self.lock:
+            values = np.array(self.samples.get(stage, ()), dtype=np.float64) * 1000
+        if values.size == 0:
+            return None
+        stats = {f'p{p:g}': round(float(np.percentile(values, p)), 3) for p in percentiles}
+        stats['mean'] = round(float(values.mean()), 3)
+        stats['count'] = int(values.size)
+        return stats
+
+    def summary(self):
+        with self.lock:
+            stages = list(self.samples)
+        return {stage: self.percentiles(stage) for stage in stages}
+
+    def status_text(self, stages=None, percentile=95):
+        """상태 표시줄용 한 줄 요약 (예: 'preprocess p95 12.3ms | yolo p95 41.0ms', percentile은 0~100 임의 값)"""
+        check_percentiles([percentile])
+        with self.lock:
+            recorded = list(self.samples)
+        name = f'p{percentile:g}'
+        parts = []
+        for stage in stages or recorded:
+            stats = self.percentiles(stage, [percentile])
+            if stats:
+                parts.append(f"{stage} {name} {stats[name]:.1f}ms")
+        return " | ".join(parts)
+
+    def dump_json(self, path):
+        dump_profiles([self], path)
+
+def dump_profiles(profilers, path):
+    """여러 스트림의 프로파일 요약을 JSON 파일로 저장"""
+    data = {
+        'created': time.strftime("%Y-%m-%d %H:%M:%S"),
+        'unit': 'ms',
+        'streams': {profiler.name: profiler.summary() for profiler in profilers},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    print(f"프로파일 결과를 저장했습니다: {path}")
+    return data
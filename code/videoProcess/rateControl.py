@@ -0,0 +1,110 @@
+import math
+import time
+
+INFERENCE_SIZES = [640, 512, 416, 320]  # 추론 해상도 단계 (32의 배수)
+TIME_SMOOTHING = 0.2  # 처리 시간 지수이동평균 계수
+UPSCALE_MARGIN = 0.6  # 분석 간격이 상한의 이 비율보다 짧으면 해상도를 올림
+RESIZE_COOLDOWN = 15  # 해상도 변경 후 다음 변경까지 최소 처리 프레임 수
+# 분석 간격 상한(초): 처리 시간이 예산을 넘으면 먼저 측정값에 맞춰 stride를 늘리고,
+# 그 간격이 이 값을 넘을 때만 추론 해상도를 낮춤 (화재 확인 지연을 이 수준으로 제한)
+MAX_ANALYSIS_INTERVAL = 0.25
+
+class AdaptiveRateController:
+    """
+    프레임 처리 시간을 측정해 프레임 간격(stride)과 추론 해상도를 조절하는 제어기
+    - 기본은 원본 fps의 모든 프레임을 분석하고, 처리 시간이 예산(1 / target_fps)을 넘으면
+      측정한 처리 시간만큼 stride를 늘림 (빠른 환경에서는 남는 CPU로 모든 프레임 분석)
+    - stride에 따른 분석 간격이 max_interval을 넘을 때만 추론 해상도를 한 단계 낮추고, 여유가 생기면 다시 올림
+    - 영상 시각이 실제 경과 시간보다 뒤처지면 밀린 프레임을 건너뛰어 따라잡음
+    - 앞서 있으면 다음 프레임까지 기다릴 시간을 알려줌 (실시간 재생 유지)
+    """
+    def __init__(self, source_fps, target_fps=None, sizes=INFERENCE_SIZES, realtime=True,
+                 max_interval=MAX_ANALYSIS_INTERVAL):
+        self.source_fps = source_fps if source_fps and source_fps > 0 else 30.0
+        self.target_fps = min(target_fps or self.source_fps, self.source_fps)
+        self.max_interval = max_interval
+        self.sizes = list(sizes)
+        self.realtime = realtime
+        self.reset()
+
+    def reset(self):
+        self.size_index = 0
+        self.processing_time = None
+        self.frames_since_resize = 0
+        self.origin = None  # 영상 시각 0초에 해당하는 실제 시각
+        self.frame_start = None
+        self.processed = 0
+        self.skipped = 0
+
+    @property
+    def imgsz(self):
+        return self.sizes[self.size_index]
+
+    @property
+    def budget(self):
+        """분석 프레임 하나에 허용되는 처리 시간(초)"""
+        return 1.0 / self.target_fps
+
+    @property
+    def stride(self):
+        """현재 처리 속도로 실시간을 유지하려면 몇 프레임마다 한 번 분석해야 하는지"""
+        min_stride = self.source_fps / self.target_fps
+        if self.processing_time is None:
+            return max(1, int(math.ceil(min_stride - 1e-6)))
+        needed = self.processing_time * self.source_fps
+        return max(1, int(math.ceil(max(min_stride, needed) - 1e-6)))
+
+    def begin_frame(self):
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """프레임 처리 시간을 반영해 해상도를 조절"""
+        elapsed = time.perf_counter() - self.frame_start
+        if self.processing_time is None:
+            self.processing_time = elapsed
+        else:
+            self.processing_time += TIME_SMOOTHING * (elapsed - self.processing_time)
+        self.processed += 1
+        self.frames_since_resize += 1
+
+        if self.frames_since_resize < RESIZE_COOLDOWN:
+            return
+        # 예산 초과분은 stride가 먼저 흡수하므로, 해상도는 분석 간격이 상한을 넘을 때만 조절
+        interval = self.stride / self.source_fps
+        if interval > self.max_interval and self.size_index < len(self.sizes) - 1:
+            self.size_index += 1
+            self.frames_since_resize = 0
+        elif (self.processing_time < self.max_interval * UPSCALE_MARGIN and self.size_index > 0
+              and interval <= self.max_interval):
+            self.size_index -= 1
+            self.frames_since_resize = 0
+
+    def next_step(self, video_time):
+        """
+        방금 처리한 프레임의 영상 시각(초)을 받아 (건너뛸 프레임 수, 기다릴 시간(초)) 반환
+        """
+        skip = self.stride - 1
+        wait = 0.0
+        if self.realtime:
+            now = time.perf_counter()
+            if self.origin is None:
+                self.origin = now - video_time
+            elapsed = now - self.origin
+            next_time = video_time + (skip + 1) / self.source_fps
+            if elapsed > next_time:
+                # 뒤처진 만큼 프레임을 더 버려 실시간을 따라잡음
+                skip += int((elapsed - next_time) * self.source_fps)
+            else:
+                wait = next_time - elapsed
+        self.skipped += skip
+        return skip, wait
+
+    def stats(self):
+        return {
+            'imgsz': self.imgsz,
+            'stride': self.stride,
+            'interval_ms': round(self.stride / self.source_fps * 1000, 1),
+            'processing_ms': round((self.processing_time or 0.0) * 1000, 1),
+            'processed': self.processed,
+            'skipped': self.skipped,
+        }
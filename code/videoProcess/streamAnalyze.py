@@ -0,0 +1,227 @@
+"""
+여러 카메라/영상 스트림을 동시에 감시하는 명령행 도구
+- StreamManager의 스트림별 대기열에서 프레임을 꺼내 스트림별 작업 스레드에서 전처리/게이트로 거른 뒤
+  InferenceService에 제출해 여러 스트림의 프레임을 한 번의 fire_model 호출로 묶어 추론
+- 스트림마다 트래커를 따로 두고, 화재가 확정되면 이벤트를 JSONL로 기록
+- 주기적으로 스트림별 fps/대기열/버린 프레임 수와 평균 배치 크기를 출력
+
+사용 예:
+    python -m code.videoProcess.streamAnalyze rtsp://192.168.0.10/stream rtsp://192.168.0.11/stream
+    python -m code.videoProcess.streamAnalyze a.mp4 b.mp4 0 --output events.jsonl --duration 600
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from code.videoProcess.streamManager import StreamManager, QUEUE_SIZE
+from code.videoProcess.inference import InferenceService, MAX_BATCH_SIZE, MAX_WAIT
+
+POLL_INTERVAL = 0.005  # 모든 스트림에 처리할 프레임이 없을 때 대기 시간(초)
+STATS_INTERVAL = 10.0  # 통계 출력 주기(초)
+PREPROCESS_WORKERS = 4  # 모든 스트림이 공유하는 전처리 스레드 수
+
+class StreamState:
+    """스트림 하나의 게이트/트래커와 전처리/추론 대기 중인 프레임"""
+    def __init__(self, stream, preprocessor, gate, tracker):
+        self.stream = stream
+        self.preprocessor = preprocessor
+        self.gate = gate
+        self.tracker = tracker
+        self.preparing = None  # (FramePacket, 전처리/게이트 작업 Future -> 추론 Future 또는 None)
+        self.pending = None  # (FramePacket, 추론 Future)
+        self.confirmed = 0
+
+class StreamAnalyzer:
+    """
+    StreamManager의 대기열을 소비하는 분석 루프
+    - 스트림마다 추론 요청은 한 번에 하나만 두고, 결과가 오면 그 사이 쌓인 최신 프레임을 다시 제출
+      (오래된 프레임은 DropOldestQueue에서 버려지므로 지연이 쌓이지 않음)
+    - 여러 스트림의 요청이 InferenceService에서 마이크로 배치로 합쳐짐
+    - 전처리와 게이트 판단은 스트림마다 작업 스레드에서 실행하고 메인 루프는 제출과 결과 수집만 담당
+      (스트림 작업은 단계별 작업을 기다리므로, 교착을 피하려고 단계용 executor와 다른 풀을 사용)
+    """
+    def __init__(self, manager, service, use_gate=True, on_event=None, preprocess_workers=PREPROCESS_WORKERS):
+        self.manager = manager
+        self.service = service
+        self.use_gate = use_gate
+        self.on_event = on_event
+        self.executor = ThreadPoolExecutor(max_workers=preprocess_workers, thread_name_prefix='preprocess')
+        # 스트림마다 작업은 한 번에 하나이므로 스트림 수만큼의 스레드면 스트림당 스레드 하나와 같음
+        self.stream_executor = ThreadPoolExecutor(max_workers=max(1, len(manager.stream_ids())),
+                                                  thread_name_prefix='stream')
+        self.states = {}
+
+    def state(self, stream_id):
+        import code.videoProcess.videoProcess as vP
+        from code.videoProcess.gating import InferenceGate
+        from code.videoProcess.tracker import FireTracker
+
+        state = self.states.get(stream_id)
+        if state is None:
+            state = StreamState(self.manager.get(stream_id), vP.FramePreprocessor(executor=self.executor),
+                                InferenceGate(), FireTracker())
+            self.states[stream_id] = state
+        return state
+
+    def prepare(self, state, packet):
+        """스트림 작업 스레드에서 전처리 후 게이트를 통과하면 추론을 제출하고 Future 반환 (걸러지면 None)"""
+        state.preprocessor.process(packet.frame)
+        if not state.gate.should_infer(*state.preprocessor.gate_masks()):
+            return None
+        return self.service.submit(packet.stream_id, packet.frame, packet.timestamp)
+
+    def step(self):
+        """각 스트림을 한 번씩 확인하고 처리한 일이 있으면 True"""
+        from code.videoProcess.tracker import extract_detections
+
+        busy = False
+        for stream_id in self.manager.stream_ids():
+            state = self.state(stream_id)
+
+            if state.preparing is not None:
+                packet, job = state.preparing
+                if not job.done():
+                    continue
+                state.preparing = None
+                busy = True
+                try:
+                    future = job.result()
+                except Exception as e:
+                    print(f"[{stream_id}] 전처리 실패: {e}")
+                    future = None
+                if future is not None:
+                    state.pending = (packet, future)
+
+            if state.pending is not None:
+                packet, future = state.pending
+                if not future.done():
+                    continue
+                state.pending = None
+                busy = True
+                try:
+                    detections = extract_detections(future.result())
+                except Exception as e:
+                    print(f"[{stream_id}] 추론 실패: {e}")
+                    continue
+                state.gate.report(bool(detections))
+                for track in state.tracker.update(detections, packet.index, packet.timestamp):
+                    state.confirmed += 1
+                    event = dict(track.to_event(), stream_id=stream_id, frame_index=packet.index)
+                    print(f"[{stream_id}] 화재 발생 확정 (트랙 {track.track_id}): {event}")
+                    if self.on_event is not None:
+                        self.on_event(event)
+
+            packet = state.stream.read(timeout=0)
+            if packet is None:
+                continue
+            busy = True
+            if self.use_gate:
+                state.preparing = (packet, self.stream_executor.submit(self.prepare, state, packet))
+            else:
+                state.pending = (packet, self.service.submit(stream_id, packet.frame, packet.timestamp))
+        return busy
+
+    def has_pending(self):
+        return any(state.preparing is not None or state.pending is not None for state in self.states.values())
+
+    def run(self, duration=None, stats_interval=STATS_INTERVAL):
+        """모든 파일 스트림이 끝나거나 duration초가 지날 때까지 분석"""
+        started = time.perf_counter()
+        last_stats = started
+        try:
+            while True:
+                if not self.step():
+                    if self.manager.all_finished() and not self.has_pending():
+                        break
+                    time.sleep(POLL_INTERVAL)
+                now = time.perf_counter()
+                if duration is not None and now - started >= duration:
+                    break
+                if stats_interval and now - last_stats >= stats_interval:
+                    self.print_stats()
+                    last_stats = now
+        finally:
+            self.print_stats()
+
+    def stats(self):
+        stats = self.manager.stats()
+        for item in stats:
+            state = self.states.get(item['stream_id'])
+            if state is not None:
+                item['gate_skip_ratio'] = round(state.gate.skip_ratio(), 3)
+                item['confirmed'] = state.confirmed
+        return stats
+
+    def print_stats(self):
+        for item in self.stats():
+            print(f"[{item['stream_id']}] {item['fps']}fps, 대기열 {item['queue_depth']}, "
+                  f"버린 프레임 {item['dropped']}개, 추론 생략 {item.get('gate_skip_ratio', 0) * 100:.1f}%, "
+                  f"확정 {item.get('confirmed', 0)}건")
+        print(f"평균 배치 크기 {self.service.average_batch_size():.2f} (배치 {self.service.batches}회)")
+
+    def close(self):
+        self.stream_executor.shutdown(wait=True)
+        for state in self.states.values():
+            state.preprocessor.close()
+        self.executor.shutdown(wait=True)
+
+def parse_source(source):
+    """숫자만 있으면 카메라 번호로 사용"""
+    return int(source) if source.isdigit() else source
+
+def main(argv=None):
+    from code.videoProcess.videoProcess import DETECTOR_BACKENDS
+    parser = argparse.ArgumentParser(description="여러 카메라/영상 스트림 동시 화재 감시")
+    parser.add_argument('sources', nargs='+', help="영상 파일, RTSP/HTTP 주소 또는 카메라 번호")
+    parser.add_argument('--output', default=None, help="확정 이벤트를 기록할 JSONL 파일")
+    parser.add_argument('--duration', type=float, default=None, help="감시 시간(초), 없으면 파일이 끝날 때까지")
+    parser.add_argument('--queue-size', type=int, default=QUEUE_SIZE, help="스트림별 프레임 대기열 길이")
+    parser.add_argument('--batch-size', type=int, default=MAX_BATCH_SIZE, help="한 번에 추론할 최대 프레임 수")
+    parser.add_argument('--max-wait', type=float, default=MAX_WAIT, help="배치를 기다리는 최대 시간(초)")
+    parser.add_argument('--fast', action='store_true', help="파일을 원래 속도가 아닌 최대 속도로 읽음")
+    parser.add_argument('--no-gate', action='store_true', help="색상/움직임 게이트 없이 모든 프레임 추론")
+    parser.add_argument('--backend', choices=DETECTOR_BACKENDS, default=None,
+                        help="감지기 백엔드 (기본: FIRE_DETECTOR_BACKEND 환경 변수 또는 torch)")
+    args = parser.parse_args(argv)
+
+    manager = StreamManager(queue_size=args.queue_size, realtime=not args.fast)
+    for source in args.sources:
+        try:
+            stream = manager.add_stream(parse_source(source))
+        except (FileNotFoundError, ValueError) as e:
+            print(f"스트림 추가 실패: {e}")
+            continue
+        print(f"스트림 {stream.stream_id}: {source}")
+    if not manager.stream_ids():
+        print("감시할 스트림이 없습니다.")
+        return 1
+
+    output = open(args.output, 'a', encoding='utf-8') if args.output else None
+    def on_event(event):
+        if output is not None:
+            output.write(json.dumps(event, ensure_ascii=False) + '\n')
+            output.flush()
+
+    service = InferenceService(max_batch_size=args.batch_size, max_wait=args.max_wait,
+                               backend=args.backend).start()
+    analyzer = StreamAnalyzer(manager, service, use_gate=not args.no_gate, on_event=on_event)
+    try:
+        analyzer.run(args.duration)
+    except KeyboardInterrupt:
+        print("감시를 중단합니다.")
+    finally:
+        manager.stop_all()
+        # 진행 중인 스트림 작업이 추론을 제출할 수 있으므로 분석기를 먼저 닫고 서비스를 멈춤
+        analyzer.close()
+        service.stop()
+        if output is not None:
+            output.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
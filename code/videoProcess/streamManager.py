@@ -0,0 +1,222 @@
+import itertools
+import os
+import threading
+import time
+from collections import deque
+
+import cv2
+
+QUEUE_SIZE = 4  # 스트림별 프레임 대기열 길이 (가득 차면 가장 오래된 프레임을 버림)
+FPS_SMOOTHING = 0.1  # fps 지수이동평균 계수
+RECONNECT_DELAY = 2.0  # 실시간 스트림이 끊겼을 때 재연결 대기 시간(초)
+STOP_TIMEOUT = 5.0  # stop()이 캡처 스레드 종료를 기다리는 최대 시간(초)
+
+def is_live_source(source):
+    """카메라 번호나 URL(rtsp://, http:// 등)이면 실시간 스트림"""
+    return isinstance(source, int) or (isinstance(source, str) and '://' in source)
+
+class FramePacket:
+    """캡처 스레드가 대기열에 넣는 프레임 단위 데이터"""
+    def __init__(self, stream_id, index, timestamp, frame):
+        self.stream_id = stream_id
+        self.index = index  # 스트림 내 프레임 번호
+        self.timestamp = timestamp  # 영상 기준 시각(초), 실시간 스트림은 캡처 시각
+        self.frame = frame
+
+class DropOldestQueue:
+    """가득 차면 가장 오래된 항목을 버리는 스레드 안전 대기열"""
+    def __init__(self, maxsize=QUEUE_SIZE):
+        self.items = deque(maxlen=max(1, maxsize))
+        self.condition = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item):
+        with self.condition:
+            if len(self.items) == self.items.maxlen:
+                self.dropped += 1
+            self.items.append(item)
+            self.condition.notify()
+
+    def get(self, timeout=None):
+        """항목이 없으면 timeout초까지 기다리고, 그래도 없으면 None"""
+        with self.condition:
+            if not self.items:
+                self.condition.wait(timeout)
+            return self.items.popleft() if self.items else None
+
+    def __len__(self):
+        with self.condition:
+            return len(self.items)
+
+class CaptureStream:
+    """
+    cv2.VideoCapture 하나를 전용 스레드에서 읽어 DropOldestQueue로 넘기는 스트림
+    - 파일은 realtime=True면 원래 fps 속도로 재생, False면 최대 속도로 읽음
+    - RTSP 등 실시간 스트림은 끊기면 재연결
+    """
+    def __init__(self, stream_id, source, queue_size=QUEUE_SIZE, realtime=True):
+        # 잘못 입력한 파일 경로를 실시간 스트림으로 보고 재연결을 반복하지 않도록 바로 실패
+        if not is_live_source(source) and not os.path.exists(source):
+            raise FileNotFoundError(f"영상 파일을 찾을 수 없습니다: {source}")
+        self.stream_id = stream_id
+        self.source = source
+        self.is_file = not is_live_source(source)
+        self.realtime = realtime
+        self.queue = DropOldestQueue(queue_size)
+        self.stopped = threading.Event()
+        self.finished = False
+        self.thread = None
+
+        # 통계
+        self.frames_read = 0
+        self.capture_fps = 0.0
+        self.source_fps = 0.0
+
+    def start(self):
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self._run, name=f'capture-{self.stream_id}', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        """
+        캡처 스레드에 종료를 알리고 timeout초까지 대기
+        RTSP read()처럼 막힌 호출은 중단할 수 없으므로, 시간 안에 끝나지 않으면 데몬 스레드로 남겨 두고 반환
+        (read()가 돌아오면 스레드가 스스로 캡처를 해제하고 종료)
+        """
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            if self.thread.is_alive():
+                print(f"스트림 {self.stream_id} 캡처 스레드가 {timeout}초 안에 끝나지 않았습니다.")
+            self.thread = None
+
+    def read(self, timeout=None):
+        """다음 FramePacket (없으면 None)"""
+        return self.queue.get(timeout)
+
+    def stats(self):
+        return {
+            'stream_id': self.stream_id,
+            'source': str(self.source),
+            'fps': round(self.capture_fps, 2),
+            'source_fps': round(self.source_fps, 2),
+            'queue_depth': len(self.queue),
+            'dropped': self.queue.dropped,
+            'frames_read': self.frames_read,
+            'finished': self.finished,
+        }
+
+    def _open(self):
+        cap = cv2.VideoCapture(self.source)
+        if not cap.isOpened():
+            print(f"스트림 열기 실패: {self.source}")
+            cap.release()
+            return None
+        self.source_fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        return cap
+
+    def _run(self):
+        cap = self._open()
+        frame_interval = 1.0 / self.source_fps if self.is_file and self.realtime and self.source_fps > 0 else 0.0
+        last_time = None
+        start_time = time.perf_counter()
+
+        while not self.stopped.is_set():
+            if cap is None:
+                if self.is_file:
+                    break
+                # 재연결 대기 중에도 stop()에 바로 반응
+                if self.stopped.wait(RECONNECT_DELAY):
+                    break
+                cap = self._open()
+                continue
+
+            ret, frame = cap.read()
+            if not ret:
+                cap.release()
+                cap = None
+                if self.is_file:
+                    break
+                continue
+
+            now = time.perf_counter()
+            if self.is_file:
+                timestamp = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            else:
+                timestamp = time.time()
+            self.queue.put(FramePacket(self.stream_id, self.frames_read, timestamp, frame))
+            self.frames_read += 1
+
+            if last_time is not None and now > last_time:
+                fps = 1.0 / (now - last_time)
+                if self.capture_fps:
+                    self.capture_fps += FPS_SMOOTHING * (fps - self.capture_fps)
+                else:
+                    self.capture_fps = fps
+            last_time = now
+
+            # 파일을 실시간 속도로 재생
+            if frame_interval:
+                delay = start_time + self.frames_read * frame_interval - time.perf_counter()
+                if delay > 0:
+                    self.stopped.wait(delay)
+
+        if cap is not None:
+            cap.release()
+        self.finished = True
+
+class StreamManager:
+    """여러 카메라/영상 파일을 동시에 여는 스트림 관리자"""
+    def __init__(self, queue_size=QUEUE_SIZE, realtime=True):
+        self.queue_size = queue_size
+        self.realtime = realtime
+        self.streams = {}
+        self.lock = threading.Lock()
+        # 스트림을 제거해도 번호가 다시 쓰이지 않도록 단조 증가 번호 사용
+        self.ids = itertools.count()
+
+    def add_stream(self, source, stream_id=None):
+        """source(파일 경로, RTSP 주소, 카메라 번호)를 열고 캡처 스레드를 시작"""
+        with self.lock:
+            if stream_id is None:
+                stream_id = f"cam{next(self.ids)}"
+                while stream_id in self.streams:
+                    stream_id = f"cam{next(self.ids)}"
+            if stream_id in self.streams:
+                raise ValueError(f"이미 등록된 스트림입니다: {stream_id}")
+            stream = CaptureStream(stream_id, source, self.queue_size, self.realtime)
+            self.streams[stream_id] = stream
+        return stream.start()
+
+    def remove_stream(self, stream_id):
+        with self.lock:
+            stream = self.streams.pop(stream_id, None)
+        if stream is not None:
+            stream.stop()
+
+    def get(self, stream_id):
+        return self.streams[stream_id]
+
+    def stream_ids(self):
+        with self.lock:
+            return list(self.streams)
+
+    def all_finished(self):
+        with self.lock:
+            return all(stream.finished and len(stream.queue) == 0 for stream in self.streams.values())
+
+    def stats(self):
+        """스트림별 fps, 대기열 길이, 버린 프레임 수"""
+        with self.lock:
+            return [stream.stats() for stream in self.streams.values()]
+
+    def stop_all(self, timeout=STOP_TIMEOUT):
+        with self.lock:
+            streams = list(self.streams.values())
+            self.streams.clear()
+        # 모든 스트림에 먼저 종료를 알린 뒤 기다려 전체 대기 시간을 줄임
+        for stream in streams:
+            stream.stopped.set()
+        for stream in streams:
+            stream.stop(timeout)
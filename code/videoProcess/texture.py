@@ -0,0 +1,108 @@
+import cv2
+import numpy as np
+from skimage.feature import graycomatrix, graycoprops
+
+TEXTURE_LEVELS = 32  # GLCM 양자화 단계 수 (16~32 권장)
+TEXTURE_SCALE = 0.25  # GLCM 계산용 축소 비율
+TEXTURE_REFRESH_INTERVAL = 5  # N 프레임마다 텍스처 값 갱신
+TEXTURE_ANGLES = [0, np.pi/4, np.pi/2, 3*np.pi/4]
+MIN_ROI_SIZE = 8  # 이보다 작은 ROI는 GLCM 계산에서 제외
+
+def fire_rois(mask, min_size=MIN_ROI_SIZE):
+    """색상 마스크에서 화재 후보 영역의 (x, y, w, h) 목록을 구함"""
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    rois = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if w >= min_size and h >= min_size:
+            rois.append((x, y, w, h))
+    return rois
+
+class TextureAnalyzer:
+    """
+    glcm_analysis()의 경량 버전
+    - 회색조를 levels 단계로 양자화
+    - 축소된 프레임 또는 화재 후보 ROI 안에서만 GLCM 계산
+    - refresh_interval 프레임마다 갱신하고 그 사이에는 마지막 값을 재사용
+    """
+    def __init__(self, levels=TEXTURE_LEVELS, scale=TEXTURE_SCALE, refresh_interval=TEXTURE_REFRESH_INTERVAL):
+        if 256 % levels != 0:
+            raise ValueError(f"levels는 256의 약수여야 합니다: {levels}")
+        self.levels = levels
+        self.scale = scale
+        self.refresh_interval = max(1, refresh_interval)
+        self.frame_count = 0
+        self.value = None  # 마지막으로 계산한 텍스처 특징값
+
+    def reset(self):
+        self.frame_count = 0
+        self.value = None
+
+    def due(self):
+        """이번 프레임에서 GLCM을 다시 계산하는지 여부"""
+        return self.value is None or self.frame_count % self.refresh_interval == 0
+
+    def refresh(self, gray, rois=None):
+        """refresh_interval 프레임마다만 GLCM을 다시 계산"""
+        if self.due():
+            self.value = self.texture_value(gray, rois)
+        self.frame_count += 1
+        return self.value
+
+    def analyze(self, frame, rois=None, gray=None):
+        """glcm_analysis()와 같은 형태의 float32 텍스처 마스크 반환"""
+        if gray is None:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+        self.refresh(gray, rois)
+
+        texture_mask = np.zeros_like(gray, dtype=np.float32)
+        texture_mask[gray > 128] = self.value  # 임계값 기반으로 마스크 생성
+        return texture_mask
+
+    def analyze_mask(self, frame, rois=None, gray=None, out=None):
+        """analyze()와 같은 마스크를 uint8 단일 채널로 반환 (out 버퍼가 있으면 재사용)"""
+        if gray is None:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+        self.refresh(gray, rois)
+
+        fill = float(np.clip(self.value, 0, 255))
+        _, mask = cv2.threshold(gray, 128, fill, cv2.THRESH_BINARY, dst=out)
+        return mask
+
+    def texture_value(self, gray, rois=None):
+        """GLCM 특징 5개의 평균값 (256단계 기준 스케일로 환산)"""
+        if rois:
+            patches = [gray[y:y+h, x:x+w] for x, y, w, h in rois]
+        else:
+            patches = [gray]
+
+        values = []
+        for patch in patches:
+            small = self.quantize(self.downscale(patch))
+            if min(small.shape) < 2:
+                continue
+            values.append(self.glcm_features(small))
+        return float(np.mean(values)) if values else 0.0
+
+    def downscale(self, gray):
+        if self.scale >= 1.0:
+            return gray
+        h, w = gray.shape
+        size = (max(2, int(w * self.scale)), max(2, int(h * self.scale)))
+        return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+
+    def quantize(self, gray):
+        return (gray // (256 // self.levels)).astype(np.uint8)
+
+    def glcm_features(self, quantized):
+        glcm = graycomatrix(quantized, [1], TEXTURE_ANGLES, self.levels, symmetric=True, normed=True)
+        # contrast/dissimilarity는 회색조 간격에 비례하므로 256단계 기준으로 환산
+        step = 256 / self.levels
+        contrast = graycoprops(glcm, 'contrast').mean() * step ** 2
+        dissimilarity = graycoprops(glcm, 'dissimilarity').mean() * step
+        homogeneity = graycoprops(glcm, 'homogeneity').mean()
+        energy = graycoprops(glcm, 'energy').mean()
+        correlation = graycoprops(glcm, 'correlation').mean()
+        return np.mean([contrast, dissimilarity, homogeneity, energy, correlation])
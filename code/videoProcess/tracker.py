@@ -0,0 +1,121 @@
+import numpy as np
+
+FIRE_CONF_THRESHOLD = 0.23  # 추적에 사용할 최소 신뢰도
+IOU_THRESHOLD = 0.3  # 같은 화재로 볼 최소 IoU
+CENTROID_DISTANCE = 0.5  # IoU가 낮아도 중심 거리가 (박스 대각선 * 이 값) 이내면 같은 화재로 봄
+CONFIRM_HITS = 5  # 확정에 필요한 최소 감지 프레임 수
+CONFIRM_SECONDS = 3.0  # 확정에 필요한 최소 지속 시간 (영상 시각 기준)
+MAX_AGE_SECONDS = 1.0  # 이 시간 동안 감지되지 않으면 트랙 삭제
+
+def extract_detections(detection_result, conf_threshold=FIRE_CONF_THRESHOLD):
+    """fire_model 결과에서 [(x1, y1, x2, y2), conf] 목록 추출"""
+    detections = []
+    for result in detection_result:
+        for box in result.boxes:
+            conf = float(box.conf[0])
+            if conf > conf_threshold:
+                detections.append((tuple(float(v) for v in box.xyxy[0]), conf))
+    return detections
+
+def iou(a, b):
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+def centroid_close(a, b, ratio=CENTROID_DISTANCE):
+    ca = ((a[0] + a[2]) / 2, (a[1] + a[3]) / 2)
+    cb = ((b[0] + b[2]) / 2, (b[1] + b[3]) / 2)
+    diagonal = np.hypot(a[2] - a[0], a[3] - a[1])
+    return np.hypot(ca[0] - cb[0], ca[1] - cb[1]) <= diagonal * ratio
+
+class FireTrack:
+    """화재 후보 하나의 추적 상태"""
+    def __init__(self, track_id, box, conf, frame_index, timestamp):
+        self.track_id = track_id
+        self.box = box
+        self.hits = 1
+        self.max_conf = conf
+        self.first_frame = frame_index
+        self.last_frame = frame_index
+        self.first_time = timestamp
+        self.last_time = timestamp
+        self.confirmed = False
+
+    def update(self, box, conf, frame_index, timestamp):
+        self.box = box
+        self.hits += 1
+        self.max_conf = max(self.max_conf, conf)
+        self.last_frame = frame_index
+        self.last_time = timestamp
+
+    @property
+    def duration(self):
+        return self.last_time - self.first_time
+
+    def to_event(self):
+        """대시보드로 보낼 확정 이벤트 요약"""
+        return {
+            'track_id': self.track_id,
+            'box': [round(v, 1) for v in self.box],
+            'confidence': round(self.max_conf, 3),
+            'first_frame': self.first_frame,
+            'last_frame': self.last_frame,
+            'first_time': round(self.first_time, 3),
+            'last_time': round(self.last_time, 3),
+            'hits': self.hits,
+        }
+
+class FireTracker:
+    """
+    IoU/중심 거리 기반의 가벼운 화재 추적기
+    - 확정은 벽시계가 아니라 감지 프레임 수와 영상 시각으로 판단 (빠른 오프라인 분석에서도 동일한 결과)
+    - 트랙마다 확정 이벤트는 한 번만 발생
+    """
+    def __init__(self, iou_threshold=IOU_THRESHOLD, confirm_hits=CONFIRM_HITS,
+                 confirm_seconds=CONFIRM_SECONDS, max_age=MAX_AGE_SECONDS):
+        self.iou_threshold = iou_threshold
+        self.confirm_hits = confirm_hits
+        self.confirm_seconds = confirm_seconds
+        self.max_age = max_age
+        self.reset()
+
+    def reset(self):
+        self.tracks = []
+        self.next_id = 0
+
+    def update(self, detections, frame_index, timestamp):
+        """이번 프레임의 감지 결과를 반영하고, 새로 확정된 트랙 목록을 반환"""
+        # IoU가 높은 쌍부터 탐욕적으로 매칭
+        pairs = []
+        for t, track in enumerate(self.tracks):
+            for d, (box, _) in enumerate(detections):
+                overlap = iou(track.box, box)
+                if overlap >= self.iou_threshold or centroid_close(track.box, box):
+                    pairs.append((overlap, t, d))
+        pairs.sort(reverse=True)
+
+        matched_tracks, matched_detections = set(), set()
+        for _, t, d in pairs:
+            if t in matched_tracks or d in matched_detections:
+                continue
+            box, conf = detections[d]
+            self.tracks[t].update(box, conf, frame_index, timestamp)
+            matched_tracks.add(t)
+            matched_detections.add(d)
+
+        for d, (box, conf) in enumerate(detections):
+            if d not in matched_detections:
+                self.tracks.append(FireTrack(self.next_id, box, conf, frame_index, timestamp))
+                self.next_id += 1
+
+        # 오래 감지되지 않은 트랙 제거
+        self.tracks = [track for track in self.tracks if timestamp - track.last_time <= self.max_age]
+
+        confirmed = []
+        for track in self.tracks:
+            if not track.confirmed and track.hits >= self.confirm_hits and track.duration >= self.confirm_seconds:
+                track.confirmed = True
+                confirmed.append(track)
+        return confirmed
@@ -1,47 +1,64 @@
+import os
+import threading
 import cv2
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from skimage.feature import graycomatrix, graycoprops
-from torchvision.models import mobilenet_v3_small
-import torch
-from ultralytics import YOLO
+# torch / torchvision / ultralytics는 첫 추론 시점에 불러옴 (get_fire_model, get_confidence_classifier)
+
+from code.videoProcess.texture import TextureAnalyzer, fire_rois
+from code.videoProcess.profiler import StageProfiler
 
 MAX_PREV_FRAMES = 5  # 저장할 이전 프레임 수 제한
-prev_frames = []  # 이전 프레임들을 저장할 리스트
+PREPROCESS_WORKERS = 4  # 전처리 단계 병렬 실행용 스레드 수
+BG_SCALE = 0.5  # 배경/움직임 모델 입력 축소 비율 (0.5면 픽셀 수 1/4)
+EVIDENCE_WEIGHTS = [0.3, 0.3, 0.3, 0.05, 0.05]  # temporal_diff, hsv_mask, ycrcb_mask, texture_features, bg_mask
+EVIDENCE_ORDER = ['temporal', 'hsv', 'ycrcb', 'texture', 'bg']  # EVIDENCE_WEIGHTS와 같은 순서
+
+# 모델 가중치 경로 (로컬 파일만 사용, 네트워크 다운로드 없음)
+FIRE_MODEL_PATH = 'model_/best.pt'
+CLASSIFIER_WEIGHTS_PATH = 'model_/confidence_classifier.pt'
+
+# 감지기 실행 방식: 'torch' (ultralytics), 'onnx' (ONNX Runtime), 'onnx-int8' (int8 양자화)
+# FIRE_DETECTOR_BACKEND 환경 변수나 명령행 도구의 --backend로 바꿀 수 있음
+DETECTOR_BACKEND = os.environ.get('FIRE_DETECTOR_BACKEND', 'torch')
+DETECTOR_BACKENDS = ('torch', 'onnx', 'onnx-int8')
+CALIBRATION_SOURCE = None  # int8 양자화 보정용 이미지 폴더 또는 영상 파일
+# 모든 감지기 백엔드가 같은 결과를 내도록 쓰는 최소 신뢰도 (ultralytics predict 기본값과 같음)
+DETECTOR_CONF_THRESHOLD = 0.25
 
-# YOLO 모델 로드
-#fire_model = YOLO('model_/best.pt')  # 실제 인식 모델을 가져오셈
+# 지연 로드된 모델 캐시 (백엔드별)
+_fire_models = {}
+_confidence_classifier = None
+_model_lock = threading.Lock()
 
-# 배경 제거기 객체를 전역 변수로 생성
-bg_subtractor_obj = cv2.createBackgroundSubtractorMOG2(
-    history=500, 
-    varThreshold=50, 
-    detectShadows=True
-)
+# preprocessing() 전용 기본 전처리기 (스트림별로는 FramePreprocessor를 따로 생성)
+default_preprocessor = None
 
 def frame_difference(frame, prev_frames):
     if not prev_frames:
         return np.zeros_like(frame)
     return cv2.absdiff(frame, prev_frames[-1])
 
-def fire_color_detection_hsv(frame):
-    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-    # 화재 색상 범위 정의 (빨간색 계열)
-    lower_red = np.array([0, 50, 50])
-    upper_red = np.array([10, 255, 255])
-    mask1 = cv2.inRange(hsv, lower_red, upper_red)
-    
-    lower_red = np.array([170, 50, 50])
-    upper_red = np.array([180, 255, 255])
-    mask2 = cv2.inRange(hsv, lower_red, upper_red)
-    
-    return cv2.bitwise_or(mask1, mask2)
+# 화재 색상 범위 정의 (빨간색 계열, HSV의 H는 0과 180 근처 두 구간)
+HSV_RED_LOWER_1 = np.array([0, 50, 50], dtype=np.uint8)
+HSV_RED_UPPER_1 = np.array([10, 255, 255], dtype=np.uint8)
+HSV_RED_LOWER_2 = np.array([170, 50, 50], dtype=np.uint8)
+HSV_RED_UPPER_2 = np.array([180, 255, 255], dtype=np.uint8)
+# 화재 색상 범위 정의 (YCrCb 공간)
+YCRCB_FIRE_LOWER = np.array([0, 133, 77], dtype=np.uint8)
+YCRCB_FIRE_UPPER = np.array([255, 173, 127], dtype=np.uint8)
 
-def fire_color_detection_ycrcb(frame):
-    ycrcb = cv2.cvtColor(frame, cv2.COLOR_BGR2YCrCb)
-    # 화재 색상 범위 정의 (YCrCb 공간)
-    lower_fire = np.array([0, 133, 77])
-    upper_fire = np.array([255, 173, 127])
-    return cv2.inRange(ycrcb, lower_fire, upper_fire)
+def fire_color_detection_hsv(frame, hsv=None, mask1=None, mask2=None, out=None):
+    """버퍼(hsv: 3채널, mask1/mask2/out: 단일 채널)를 넘기면 새 배열을 만들지 않음"""
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV, dst=hsv)
+    mask1 = cv2.inRange(hsv, HSV_RED_LOWER_1, HSV_RED_UPPER_1, dst=mask1)
+    mask2 = cv2.inRange(hsv, HSV_RED_LOWER_2, HSV_RED_UPPER_2, dst=mask2)
+    return cv2.bitwise_or(mask1, mask2, dst=out)
+
+def fire_color_detection_ycrcb(frame, ycrcb=None, out=None):
+    ycrcb = cv2.cvtColor(frame, cv2.COLOR_BGR2YCrCb, dst=ycrcb)
+    return cv2.inRange(ycrcb, YCRCB_FIRE_LOWER, YCRCB_FIRE_UPPER, dst=out)
 
 def glcm_analysis(frame):
     gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
@@ -61,7 +78,7 @@ def glcm_analysis(frame):
     return texture_mask
 
 def combine_evidences(evidences):
-    weights = [0.3, 0.3, 0.3, 0.05, 0.05]  # temporal_diff, hsv_mask, ycrcb_mask, texture_features, bg_mask
+    weights = EVIDENCE_WEIGHTS
     combined = np.zeros_like(evidences[0], dtype=np.float32)
     
     for evidence, weight in zip(evidences, weights):
@@ -73,46 +90,276 @@ def combine_evidences(evidences):
     
     return np.clip(combined, 0, 255).astype(np.uint8)
 
-def bg_subtractor(frame):
-    return bg_subtractor_obj.apply(frame)
+def create_bg_subtractor():
+    # 배경 제거기는 프레임 순서에 의존하는 상태를 가지므로 스트림마다 하나씩 생성
+    return cv2.createBackgroundSubtractorMOG2(
+        history=500, 
+        varThreshold=50, 
+        detectShadows=True
+    )
+
+def bg_subtractor(frame, subtractor):
+    return subtractor.apply(frame)
 
 # 멀티스케일 접근법
 def preprocessing(frame):
-    # 이전 프레임 관리
-    global prev_frames
-    prev_frames.append(frame)
-    if len(prev_frames) > MAX_PREV_FRAMES:
-        prev_frames.pop(0)
-    
-    #시간적 일관성 확인
-    temporal_diff = frame_difference(frame, prev_frames)
-    
-    #배경 추정
-    bg_mask = bg_subtractor(frame)
-    
-    #다중 색상공간 활용
-    hsv_mask = fire_color_detection_hsv(frame)
-    ycrcb_mask = fire_color_detection_ycrcb(frame)
-    
-    #텍스처 분석 추가
-    texture_features = glcm_analysis(frame)
-    
-    # 모든 마스크를 3채널로 변환
-    temporal_diff = cv2.cvtColor(temporal_diff, cv2.COLOR_GRAY2BGR) if len(temporal_diff.shape) == 2 else temporal_diff
-    bg_mask = cv2.cvtColor(bg_mask, cv2.COLOR_GRAY2BGR) if len(bg_mask.shape) == 2 else bg_mask
-    hsv_mask = cv2.cvtColor(hsv_mask, cv2.COLOR_GRAY2BGR) if len(hsv_mask.shape) == 2 else hsv_mask
-    ycrcb_mask = cv2.cvtColor(ycrcb_mask, cv2.COLOR_GRAY2BGR) if len(ycrcb_mask.shape) == 2 else ycrcb_mask
-    texture_features = cv2.cvtColor(texture_features.astype(np.uint8), cv2.COLOR_GRAY2BGR) if len(texture_features.shape) == 2 else texture_features
-    
-    return combine_evidences([temporal_diff, hsv_mask, ycrcb_mask, texture_features, bg_mask])
+    """기본 전처리기 하나로 처리 (단일 스트림용, 반환 배열은 다음 호출 때 덮어써짐)"""
+    global default_preprocessor
+    if default_preprocessor is None:
+        default_preprocessor = FramePreprocessor()
+    default_preprocessor.process(frame)
+    return default_preprocessor.to_display()
+
+class EvidenceFuser:
+    """
+    단일 채널 uint8 마스크들을 미리 할당한 float32 누적 버퍼에 가중합하는 융합기
+    스트림마다 하나씩 두고 사용하며, 반환되는 배열은 다음 호출 때 덮어써짐
+    """
+    def __init__(self, weights=EVIDENCE_WEIGHTS):
+        self.weights = weights
+        self.shape = None
+        self.buffers = {}
+
+    def allocate(self, shape):
+        self.shape = shape
+        self.accumulator = np.zeros(shape, dtype=np.float32)
+        self.gray = np.zeros(shape, dtype=np.uint8)
+        self.fused = np.zeros(shape, dtype=np.uint8)
+        self.display = np.zeros(shape + (3,), dtype=np.uint8)
+        self.buffers = {}
+
+    def buffer(self, name, shape, channels=1):
+        """단계별 출력용 uint8 버퍼 (프레임 크기가 바뀔 때만 새로 할당, 색상공간 변환용은 channels=3)"""
+        if shape != self.shape:
+            self.allocate(shape)
+        if name not in self.buffers:
+            self.buffers[name] = np.zeros(shape if channels == 1 else shape + (channels,), dtype=np.uint8)
+        return self.buffers[name]
+
+    def fuse(self, evidences):
+        shape = evidences[0].shape[:2]
+        if shape != self.shape:
+            self.allocate(shape)
+
+        # accumulateWeighted를 누적 가중치 비율로 연속 적용하면 가중평균이 됨
+        # (첫 마스크는 alpha=1 이므로 누적 버퍼를 따로 초기화할 필요 없음)
+        running_weight = 0.0
+        for evidence, weight in zip(evidences, self.weights):
+            if evidence.ndim == 3:
+                evidence = cv2.cvtColor(evidence, cv2.COLOR_BGR2GRAY, dst=self.gray)
+            running_weight += weight
+            cv2.accumulateWeighted(evidence, self.accumulator, weight / running_weight)
+
+        # 가중평균 * 가중치 합 = 가중합, uint8로 포화 변환
+        cv2.convertScaleAbs(self.accumulator, dst=self.fused, alpha=running_weight)
+        return self.fused
+
+    def to_display(self):
+        """표시용으로만 3채널로 확장"""
+        return cv2.cvtColor(self.fused, cv2.COLOR_GRAY2BGR, dst=self.display)
+
+class FramePreprocessor:
+    """
+    스트림 하나의 전처리 상태(이전 프레임 링 버퍼, MOG2, 텍스처 캐시, 융합 버퍼)를 모두 소유하는 전처리기
+    - 스트림마다 인스턴스를 따로 두므로 여러 영상을 동시에 처리해도 배경 모델이 섞이지 않음
+    - 시간차, 색상공간, 텍스처 분석은 스레드 풀에서 병렬로 실행하고 프레임 단위로 합류
+      (OpenCV는 연산 중 GIL을 해제하므로 프레임당 지연이 가장 느린 단계 수준으로 줄어듦)
+    - 배경(MOG2)과 움직임(프레임 차) 모델은 bg_scale로 축소한 프레임에서 계산하고,
+      융합할 때만 원래 해상도로 확대 (추론 게이트는 축소 마스크를 그대로 사용)
+    - executor를 넘기면 여러 스트림이 하나의 스레드 풀을 공유
+    - 단계별 처리 시간은 profiler(StageProfiler)에 기록
+    """
+    def __init__(self, executor=None, max_workers=PREPROCESS_WORKERS, max_prev_frames=MAX_PREV_FRAMES,
+                 profiler=None, bg_scale=BG_SCALE):
+        self.profiler = profiler or StageProfiler()
+        self.owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='preprocess')
+        self.max_prev_frames = max(2, max_prev_frames)
+        self.bg_scale = min(1.0, bg_scale)
+        self.bg_subtractor_obj = create_bg_subtractor()
+        self.texture_analyzer = TextureAnalyzer()
+        self.fuser = EvidenceFuser()
+        self.masks = {}  # 마지막 프레임의 단계별 마스크 (추론 게이트 등에서 사용)
+
+        # 축소 해상도 버퍼와 회색조 이전 프레임 링 버퍼 (프레임 크기를 알게 되면 할당)
+        self.frame_shape = None
+        self.small_frame = None
+        self.small_temporal = None
+        self.history = None
+        self.history_index = 0
+        self.history_count = 0
+
+    def reset(self):
+        """새 영상을 시작할 때 스트림 상태 초기화"""
+        self.bg_subtractor_obj = create_bg_subtractor()
+        self.texture_analyzer.reset()
+        self.masks = {}
+        self.frame_shape = None
+        self.history = None
+        self.history_index = 0
+        self.history_count = 0
+
+    def allocate(self, shape):
+        """프레임 크기가 바뀔 때만 축소 해상도 버퍼와 링 버퍼를 새로 할당"""
+        self.frame_shape = shape
+        height, width = shape
+        small_shape = (max(1, int(height * self.bg_scale)), max(1, int(width * self.bg_scale)))
+        self.small_frame = np.zeros(small_shape + (3,), dtype=np.uint8)
+        self.small_temporal = np.zeros(small_shape, dtype=np.uint8)
+        self.history = np.zeros((self.max_prev_frames,) + small_shape, dtype=np.uint8)
+        self.history_index = 0
+        self.history_count = 0
+
+    def downscale(self, image, out):
+        if image.shape[:2] == out.shape[:2]:
+            out[...] = image
+            return out
+        return cv2.resize(image, (out.shape[1], out.shape[0]), dst=out, interpolation=cv2.INTER_AREA)
+
+    def upscale(self, mask, out):
+        if mask.shape[:2] == out.shape[:2]:
+            out[...] = mask
+            return out
+        return cv2.resize(mask, (out.shape[1], out.shape[0]), dst=out, interpolation=cv2.INTER_NEAREST)
+
+    def push_frame(self, gray):
+        """축소한 회색조 프레임을 링 버퍼에 기록하고 (현재, 직전) 프레임 반환 - O(1)"""
+        prev = None
+        if self.history_count > 0:
+            prev = self.history[(self.history_index - 1) % self.max_prev_frames]
+        small_gray = self.downscale(gray, self.history[self.history_index])
+
+        self.history_index = (self.history_index + 1) % self.max_prev_frames
+        self.history_count = min(self.history_count + 1, self.max_prev_frames)
+        return small_gray, prev
+
+    def texture_rois(self, shape):
+        """직전 프레임 HSV 마스크의 화재 후보 ROI (텍스처를 다시 계산하는 프레임에서만, 없으면 전체 프레임)"""
+        prev_hsv = self.masks.get('hsv')
+        if prev_hsv is None or prev_hsv.shape != shape or not self.texture_analyzer.due():
+            return None
+        return fire_rois(prev_hsv) or None
+
+    def temporal_difference(self, gray, prev, out):
+        # 첫 프레임은 비교할 대상이 없으므로 빈 마스크
+        if prev is None:
+            self.small_temporal.fill(0)
+        else:
+            cv2.absdiff(gray, prev, dst=self.small_temporal)
+        return self.upscale(self.small_temporal, out)
+
+    def process(self, frame):
+        """프레임 하나를 전처리해 단일 채널 uint8 융합 마스크 반환"""
+        profiler = self.profiler
+        with profiler.stage('preprocess'):
+            shape = frame.shape[:2]
+            if shape != self.frame_shape:
+                self.allocate(shape)
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self.fuser.buffer('gray', shape))
+            small_gray, prev = self.push_frame(gray)
+
+            # 시간차, 색상공간, 텍스처 분석은 서로 독립이므로 스레드 풀에 제출
+            # (버퍼는 작업 스레드에서 dict가 바뀌지 않도록 제출 전에 호출 스레드에서 준비)
+            # (HSV 버퍼는 이번 프레임에서 덮어쓰므로 직전 마스크의 ROI도 제출 전에 구함)
+            buffer = self.fuser.buffer
+            rois = self.texture_rois(shape)
+            temporal_out = buffer('temporal', shape)
+            texture_out = buffer('texture', shape)
+            hsv_buffers = (buffer('hsv_image', shape, 3), buffer('hsv_low', shape), buffer('hsv_high', shape), buffer('hsv', shape))
+            ycrcb_buffers = (buffer('ycrcb_image', shape, 3), buffer('ycrcb', shape))
+            temporal_future = self.executor.submit(profiler.wrap('frame_diff', self.temporal_difference), small_gray, prev, temporal_out)
+            hsv_future = self.executor.submit(profiler.wrap('hsv', fire_color_detection_hsv), frame, *hsv_buffers)
+            ycrcb_future = self.executor.submit(profiler.wrap('ycrcb', fire_color_detection_ycrcb), frame, *ycrcb_buffers)
+            texture_future = self.executor.submit(profiler.wrap('texture', self.texture_analyzer.analyze_mask), frame, rois, gray, texture_out)
+
+            # MOG2는 프레임 순서에 의존하므로 호출 스레드에서 순서대로 실행 (축소 프레임 사용)
+            with profiler.stage('mog2'):
+                bg_small = bg_subtractor(self.downscale(frame, self.small_frame), self.bg_subtractor_obj)
+                bg_mask = self.upscale(bg_small, self.fuser.buffer('bg', shape))
+
+            # 프레임 단위로 합류 후 단일 채널로 융합
+            self.masks = {
+                'temporal': temporal_future.result(),
+                'hsv': hsv_future.result(),
+                'ycrcb': ycrcb_future.result(),
+                'texture': texture_future.result(),
+                'bg': bg_mask,
+                'bg_small': bg_small
+            }
+            with profiler.stage('fusion'):
+                return self.fuser.fuse([self.masks[name] for name in EVIDENCE_ORDER])
+
+    def gate_masks(self):
+        """InferenceGate.should_infer()에 넘길 (HSV, YCrCb, MOG2) 마스크 (MOG2는 축소 해상도 그대로)"""
+        return self.masks['hsv'], self.masks['ycrcb'], self.masks['bg_small']
+
+    def to_display(self):
+        """마지막 융합 결과를 표시용 3채널 이미지로 반환"""
+        return self.fuser.to_display()
+
+    def close(self):
+        if self.owns_executor:
+            self.executor.shutdown(wait=True)
+
+def get_fire_model(path=FIRE_MODEL_PATH, backend=None, threads=None):
+    """
+    YOLO 화재 감지 모델을 백엔드별로 처음 호출될 때 한 번만 로드
+    backend가 없으면 호출 시점의 DETECTOR_BACKEND 사용 (실행 중에 바꾼 설정도 반영)
+    threads: 추론 스레드 수 (없으면 OMP_NUM_THREADS 또는 백엔드 기본값, 처음 로드할 때만 적용)
+    """
+    backend = backend or DETECTOR_BACKEND
+    if backend not in DETECTOR_BACKENDS:
+        raise ValueError(f"지원하지 않는 감지기 백엔드입니다: {backend}")
+    key = (path, backend)
+    with _model_lock:
+        model = _fire_models.get(key)
+        if model is None:
+            if backend == 'torch':
+                from ultralytics import YOLO
+                if threads:
+                    import torch
+                    torch.set_num_threads(threads)
+                model = YOLO(path)
+                # 호출마다 conf를 넘기지 않아도 ONNX 백엔드와 같은 기준으로 거름
+                model.overrides['conf'] = DETECTOR_CONF_THRESHOLD
+            else:
+                # CPU 전용 환경용: ONNX로 한 번 변환해 ONNX Runtime으로 실행
+                from code.videoProcess.onnxBackend import load_onnx_detector
+                model = load_onnx_detector(path, int8=(backend == 'onnx-int8'), calibration_source=CALIBRATION_SOURCE,
+                                           intra_op_threads=threads)
+            _fire_models[key] = model
+    return model
+
+def get_confidence_classifier(weights_path=CLASSIFIER_WEIGHTS_PATH):
+    """간단한 이진 분류기 (화재/비화재)를 처음 호출될 때 한 번만 생성"""
+    global _confidence_classifier
+    with _model_lock:
+        if _confidence_classifier is None:
+            import torch
+            from torchvision.models import mobilenet_v3_small
+
+            # 사전학습 가중치를 내려받지 않고 구조만 생성
+            classifier = mobilenet_v3_small(weights=None)
+            classifier.classifier[3] = torch.nn.Linear(1024, 2)  # 출력층을 2개 클래스로 수정
+            if os.path.exists(weights_path):
+                classifier.load_state_dict(torch.load(weights_path, map_location='cpu'))
+            else:
+                print(f"경고: 분류기 가중치 파일을 찾을 수 없습니다: {weights_path}")
+            classifier.eval()
+            _confidence_classifier = classifier
+    return _confidence_classifier
 
-# 간단한 이진 분류기 (화재/비화재)
-confidence_classifier = mobilenet_v3_small(pretrained=True)
-confidence_classifier.classifier[3] = torch.nn.Linear(1024, 2)  # 출력층을 2개 클래스로 수정
+def __getattr__(name):
+    # 기존 코드의 vP.confidence_classifier / vP.fire_model 접근 호환
+    if name == 'confidence_classifier':
+        return get_confidence_classifier()
+    if name == 'fire_model':
+        return get_fire_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def visualize_fire_detection(image, detection_result):
-    # 원본 이미지 복사
-    vis_image = image.copy()
+def visualize_fire_detection(image, detection_result, copy=True):
+    # 원본 이미지 복사 (copy=False면 전달된 버퍼에 바로 그림)
+    vis_image = image.copy() if copy else image
     
     # 화재 감지 결과 시각화
     for result in detection_result: